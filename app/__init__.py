@@ -40,6 +40,23 @@ def _ensure_upgrade_policy_columns():
             db.session.rollback()
 
 
+_INDEX_DDL = (
+    "CREATE INDEX IF NOT EXISTS ix_customcheck_owner_name ON custom_checks (created_by, name)",
+    "CREATE INDEX IF NOT EXISTS ix_builds_triggered_by ON builds (triggered_by)",
+)
+
+
+def _ensure_indexes():
+    """Add indexes that create_all() skips on pre-existing tables."""
+    import sqlalchemy
+    try:
+        for ddl in _INDEX_DDL:
+            db.session.execute(sqlalchemy.text(ddl))
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+
+
 def _seed_builtin_templates():
     """Create built-in shared templates if they don't exist yet."""
     from app.models import Template, User
@@ -124,6 +141,7 @@ def create_app(config_object=None):
         app.config['SQLALCHEMY_DATABASE_URI'] = Config.SQLALCHEMY_DATABASE_URI
         app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = Config.SQLALCHEMY_TRACK_MODIFICATIONS
         app.config['OPEN_REGISTRATION'] = Config.OPEN_REGISTRATION
+        app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH
     
     # Initialize extensions
     db.init_app(app)
@@ -136,6 +154,7 @@ def create_app(config_object=None):
         from app.models_operators import OperatorInstall, DeployerConfig, DeployerRun  # noqa: F401
         db.create_all()
         _ensure_upgrade_policy_columns()
+        _ensure_indexes()
 
         # Seed built-in shared templates (idempotent)
         _seed_builtin_templates()
@@ -0,0 +1,16 @@
+"""Small SQLAlchemy session helpers shared by the audit writer and build history."""
+from sqlalchemy import text
+
+from app.models import db
+
+
+def relaxed_commit():
+    """Commit log-grade rows without waiting for the WAL flush.
+
+    On PostgreSQL this sets ``synchronous_commit`` off for the current
+    transaction only, so a crash can lose the last few milliseconds of such
+    writes but never corrupts anything.  Other backends get a plain commit.
+    """
+    if db.session.get_bind().dialect.name == 'postgresql':
+        db.session.execute(text('SET LOCAL synchronous_commit TO OFF'))
+    db.session.commit()
@@ -4,11 +4,29 @@ Provides role-checking decorators and a unified audit logger so that
 app.routes, app.admin, and app.auth share a single implementation of each.
 """
 
+import atexit
+import logging
+import queue
+import threading
+import time
+from datetime import datetime, timezone
 from functools import wraps
 
-from flask import request
+from flask import current_app, has_request_context, request
 from flask_login import login_required, current_user
 
+_AUDIT_BATCH_SIZE = 100
+_AUDIT_FLUSH_INTERVAL = 1.0  # seconds a batch may wait for more entries
+
+_audit_queue = queue.SimpleQueue()
+_audit_writer_lock = threading.Lock()
+_audit_app = None
+_audit_thread = None
+_audit_stopped = False
+_AUDIT_STOP = object()  # queue sentinel: flush the batch in hand, then exit
+
+log = logging.getLogger(__name__)
+
 
 def operator_required(f):
     """Require the current user to have operator or admin role."""
@@ -32,27 +50,127 @@ def admin_required(f):
     return decorated
 
 
+def _write_audit_rows(rows):
+    """Bulk-insert queued audit rows in one transaction.
+
+    If the batch insert fails, the rows are retried one at a time so a single
+    bad entry only loses itself.
+    """
+    from sqlalchemy import insert
+    from app.models import db, AuditLog
+    from app.dbutil import relaxed_commit
+    with _audit_app.app_context():
+        try:
+            db.session.execute(insert(AuditLog), rows)
+            relaxed_commit()
+            return
+        except Exception:
+            db.session.rollback()
+            if len(rows) == 1:
+                log.warning('Dropping audit entry %r: insert failed', rows[0].get('action'), exc_info=True)
+                return
+        for row in rows:
+            try:
+                db.session.execute(insert(AuditLog), [row])
+                relaxed_commit()
+            except Exception:
+                db.session.rollback()
+                log.warning('Dropping audit entry %r: insert failed', row.get('action'), exc_info=True)
+
+
+def _audit_writer():
+    """Background loop: collect up to a batch (or one interval's worth) and flush it.
+
+    Returns after flushing once it takes _AUDIT_STOP off the queue.
+    """
+    while True:
+        item = _audit_queue.get()
+        if item is _AUDIT_STOP:
+            return
+        rows = [item]
+        stopping = False
+        deadline = time.monotonic() + _AUDIT_FLUSH_INTERVAL
+        try:
+            while len(rows) < _AUDIT_BATCH_SIZE:
+                item = _audit_queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                if item is _AUDIT_STOP:
+                    stopping = True
+                    break
+                rows.append(item)
+        except queue.Empty:
+            pass
+        _write_audit_rows(rows)
+        if stopping:
+            return
+
+
+def _drain_audit_queue():
+    """Synchronously write whatever is still queued (nothing may be consuming it)."""
+    rows = []
+    try:
+        while True:
+            item = _audit_queue.get_nowait()
+            if item is not _AUDIT_STOP:
+                rows.append(item)
+    except queue.Empty:
+        pass
+    if rows and _audit_app is not None:
+        _write_audit_rows(rows)
+
+
+def stop_audit_writer(timeout=10.0):
+    """Stop the writer after it flushes the batch it holds, then write anything left.
+
+    Registered with atexit, and called from the SIGTERM path in run.py, so
+    queued entries survive a normal shutdown. Later entries are written by
+    the next call; the writer is not restarted.
+    """
+    global _audit_thread, _audit_stopped
+    with _audit_writer_lock:
+        thread, _audit_thread = _audit_thread, None
+        _audit_stopped = True
+    if thread is not None:
+        _audit_queue.put(_AUDIT_STOP)
+        thread.join(timeout)
+    _drain_audit_queue()
+
+
+def _ensure_audit_writer():
+    """Start the writer thread on first use, bound to the current app."""
+    global _audit_app, _audit_thread
+    if _audit_thread is not None:
+        return
+    with _audit_writer_lock:
+        if _audit_app is None:
+            _audit_app = current_app._get_current_object()
+            atexit.register(stop_audit_writer)
+        if _audit_thread is None and not _audit_stopped:
+            _audit_thread = threading.Thread(target=_audit_writer, name='audit-writer', daemon=True)
+            _audit_thread.start()
+
+
 def log_audit(action, target=None, details=None, user_id=None, username=None):
     """Record an audit log entry.
 
     Accepts optional *user_id* / *username* for contexts where there is no
     authenticated session (e.g. scheduler).  Falls back to ``current_user``
     when available.  Never raises -- audit must not break application flow.
+    The entry is queued and bulk-inserted by a background writer, so the
+    caller does not pay for an extra INSERT + commit.
     """
-    from app.models import db, AuditLog
     try:
         if user_id is None and current_user and current_user.is_authenticated:
             user_id = current_user.id
             username = current_user.username
-        entry = AuditLog(
-            user_id=user_id,
-            username=username or 'system',
-            action=action,
-            target=target,
-            details=details,
-            ip_address=getattr(request, 'remote_addr', None),
-        )
-        db.session.add(entry)
-        db.session.commit()
+        _ensure_audit_writer()
+        _audit_queue.put({
+            'user_id': user_id,
+            'username': username or 'system',
+            'action': action,
+            'target': target,
+            'details': details,
+            'ip_address': request.remote_addr if has_request_context() else None,
+            'timestamp': datetime.now(timezone.utc),
+        })
     except Exception:
         pass
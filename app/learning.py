@@ -42,6 +42,33 @@ def load_learning_data():
     return data
 
 
+_learning_cache = (None, None)  # (learning file mtime_ns, parsed data) shared by read-only getters
+
+
+def _learning_snapshot():
+    """Learning data for read-only callers; re-parsed only when the file's mtime changes.
+
+    The returned dict is shared between callers and must not be mutated;
+    writers go through load_learning_data() / save_learning_data().
+    """
+    global _learning_cache
+    try:
+        mtime = os.stat(LEARNING_FILE).st_mtime_ns
+    except OSError:
+        return load_learning_data()
+    cached = _learning_cache
+    if cached[0] == mtime:
+        return cached[1]
+    data = load_learning_data()
+    try:
+        # Only keep it if no save landed mid-read (the parse may have seen a partial file).
+        if os.stat(LEARNING_FILE).st_mtime_ns == mtime:
+            _learning_cache = (mtime, data)
+    except OSError:
+        pass
+    return data
+
+
 def save_learning_data(data):
     """Save learning data to file"""
     data["last_updated"] = datetime.now().isoformat()
@@ -234,13 +261,13 @@ def _maybe_promote_to_knowledge_base(issue_key, pattern):
 
 def get_learned_patterns():
     """Get all learned patterns for use in health checks"""
-    data = load_learning_data()
+    data = _learning_snapshot()
     return data.get("patterns", {})
 
 
 def get_recurring_issues(min_count=2):
     """Get issues that have occurred multiple times"""
-    data = load_learning_data()
+    data = _learning_snapshot()
     recurring = {}
     
     for key, issue in data.get("recurring_issues", {}).items():
@@ -252,7 +279,7 @@ def get_recurring_issues(min_count=2):
 
 def get_issue_trends(days=7):
     """Analyze issue trends over recent period"""
-    data = load_learning_data()
+    data = _learning_snapshot()
     cutoff = (datetime.now() - timedelta(days=days)).isoformat()
     
     recent = [h for h in data.get("issue_history", []) if h["timestamp"] > cutoff]
@@ -291,7 +318,7 @@ def record_fix_applied(issue_key, fix_description, success=True):
 
 def get_suggested_fix(issue_key):
     """Get the most successful fix for an issue based on learning"""
-    data = load_learning_data()
+    data = _learning_snapshot()
     fixes = data.get("learned_fixes", {}).get(issue_key, [])
     
     if not fixes:
@@ -315,7 +342,7 @@ def get_suggested_fix(issue_key):
 
 def get_learning_stats():
     """Get statistics about the learning system"""
-    data = load_learning_data()
+    data = _learning_snapshot()
     
     return {
         "total_runs": data.get("total_runs", 0),
@@ -333,7 +360,7 @@ def match_learned_patterns(issue):
     Match an issue against learned patterns.
     Returns matching patterns sorted by confidence.
     """
-    data = load_learning_data()
+    data = _learning_snapshot()
     patterns = data.get("patterns", {})
     
     if not patterns:
@@ -5,6 +5,8 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_login import UserMixin
 from flask_bcrypt import Bcrypt
 
+from app.timefmt import run_log_prefix
+
 db = SQLAlchemy()
 bcrypt = Bcrypt()
 
@@ -58,6 +60,10 @@ class Build(db.Model):
     """Build record model - replaces .builds.json storage."""
 
     __tablename__ = 'builds'
+    __table_args__ = (
+        # History "My builds" view filters on the triggering user
+        db.Index('ix_builds_triggered_by', 'triggered_by'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     build_number = db.Column(db.Integer, unique=True, nullable=False, index=True)
@@ -75,9 +81,13 @@ class Build(db.Model):
     duration = db.Column(db.String(20), default='')
     scheduled = db.Column(db.Boolean, default=False)
 
-    def to_dict(self):
-        """Convert to dictionary (for backward compatibility with templates)."""
-        return {
+    def to_dict(self, include_output=True):
+        """Convert to dictionary (for backward compatibility with templates).
+
+        Pass ``include_output=False`` when ``output`` was deferred, so the
+        console blob is not lazy-loaded just to fill the dict.
+        """
+        d = {
             'number': self.build_number,
             'name': self.name or '',
             'status': self.status,
@@ -85,7 +95,6 @@ class Build(db.Model):
             'checks': self.checks or [],
             'checks_count': self.checks_count,
             'options': self.options or {},
-            'output': self.output or '',
             'report_file': self.report_file,
             'timestamp': self.started_at.strftime('%Y-%m-%d %H:%M') if self.started_at else '',
             'started_at_iso': self.started_at.isoformat() + 'Z' if self.started_at else '',
@@ -93,6 +102,9 @@ class Build(db.Model):
             'triggered_by': self.triggered_by_user.username if self.triggered_by_user else 'system',
             'scheduled': self.scheduled,
         }
+        if include_output:
+            d['output'] = self.output or ''
+        return d
 
     def __repr__(self):
         return f'<Build #{self.build_number} ({self.status})>'
@@ -214,6 +226,10 @@ class CustomCheck(db.Model):
     """User-defined custom health checks."""
 
     __tablename__ = 'custom_checks'
+    __table_args__ = (
+        # Per-owner listing/export and merge-import name checks
+        db.Index('ix_customcheck_owner_name', 'created_by', 'name'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(200), nullable=False)
@@ -455,18 +471,7 @@ class UpgradeRun(db.Model):
     owner = db.relationship('User', backref='upgrade_runs', foreign_keys=[created_by])
 
     def append_log(self, msg, level='info'):
-        ts = datetime.now(timezone.utc).strftime('%H:%M:%S')
-        prefix = {
-            'phase': f'[{ts}] ▶ ',
-            'ok': f'[{ts}] ✅ ',
-            'fail': f'[{ts}] ❌ ',
-            'warn': f'[{ts}] ⚠️  ',
-            'wait': f'[{ts}] ⏳ ',
-            'skip': f'[{ts}] ⏭️  ',
-            'divider': f'[{ts}] {"─" * 50}\n[{ts}] ',
-            'info': f'[{ts}] ',
-        }.get(level, f'[{ts}] ')
-        self.log = (self.log or '') + f'{prefix}{msg}\n'
+        self.log = (self.log or '') + f'{run_log_prefix(level)}{msg}\n'
 
     def to_dict(self):
         return {
@@ -7,6 +7,9 @@ Models here support the OCP Deployer and Operator Management frontend.
 from datetime import datetime, timezone
 
 from app.models import db
+from app.timefmt import hhmmss
+
+_OPERATOR_LOG_MARKS = {'phase': '>>> ', 'ok': 'OK  ', 'fail': 'ERR ', 'wait': '... '}
 
 
 class OperatorInstall(db.Model):
@@ -32,14 +35,7 @@ class OperatorInstall(db.Model):
                       'removed', 'failed')
 
     def append_log(self, msg, level='info'):
-        ts = datetime.now(timezone.utc).strftime('%H:%M:%S')
-        prefix = {
-            'phase': f'[{ts}] >>> ',
-            'ok': f'[{ts}] OK  ',
-            'fail': f'[{ts}] ERR ',
-            'wait': f'[{ts}] ... ',
-            'info': f'[{ts}]     ',
-        }.get(level, f'[{ts}]     ')
+        prefix = f'[{hhmmss(utc=True)}] {_OPERATOR_LOG_MARKS.get(level, "    ")}'
         self.log = (self.log or '') + f'{prefix}{msg}\n'
 
     def to_dict(self):
@@ -3,45 +3,87 @@
 Multi-user with concurrent builds, role-based access, and audit logging.
 """
 
+import functools
 import os
+import re
 import sys
-import json
 import threading
-from datetime import datetime
+import time
+from collections import deque, namedtuple
+from datetime import datetime, timedelta
 
 from flask import Blueprint
+from sqlalchemy.orm import joinedload
 
 from app.models import Host
+from app.timefmt import hhmmss as _ts  # noqa: F401  (console-line stamps, re-exported)
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config.settings import Config, AVAILABLE_CHECKS, CNV_SCENARIOS
 
+# Re-exported: the blueprint modules (and scheduler.py) import these from app.routes.
+from app.routes.output import (  # noqa: F401
+    _log,
+    close_output_log,
+    get_full_output,
+    get_output,
+    new_output,
+    new_output_log,
+)
+from app.routes.store import (  # noqa: F401
+    DEFAULT_SETTINGS,
+    DEFAULT_THRESHOLDS,
+    _DEFAULT_CNV_SETTINGS,
+    _json_loads,
+    _not_modified,
+    _write_json_file,
+    add_schedule,
+    fast_jsonify,
+    find_schedule,
+    find_suggested_check,
+    load_schedules,
+    load_settings,
+    load_suggested_checks,
+    record_suggested_check,
+    remove_schedule,
+    save_schedules,
+    save_settings,
+    save_suggested_checks,
+    schedules,
+    settings_snapshot,
+    suggested_checks,
+)
+from app.routes.issues import extract_issues_from_output, has_issue_candidates  # noqa: F401
+
 dashboard_bp = Blueprint('dashboard', __name__)
 
 BASE_DIR = Config.BASE_DIR
 REPORTS_DIR = Config.REPORTS_DIR
+os.makedirs(REPORTS_DIR, exist_ok=True)  # once at import; build threads write here
+_REPORTS_REAL = os.path.realpath(REPORTS_DIR)  # resolved once; report deletes check paths against it
 SCRIPT_PATH = os.path.join(BASE_DIR, "healthchecks", "hybrid_health_check.py")
 CNV_SCRIPT_PATH = os.path.join(BASE_DIR, "healthchecks", "cnv_scenarios.py")
-SCHEDULES_FILE = os.path.join(BASE_DIR, "schedules.json")
-SETTINGS_FILE = os.path.join(BASE_DIR, ".settings.json")
 
 MAX_CONCURRENT = Config.MAX_CONCURRENT_BUILDS
 running_jobs = {}
-queued_jobs = []
+queued_jobs = deque()
 _jobs_lock = threading.Lock()
 
+
+def find_running_job(build_num):
+    """Return the running job dict for ``build_num``, or None.
+
+    ``_jobs_lock`` guards the registry only, so it is held just for the
+    scan; callers format the job after it is released.
+    """
+    with _jobs_lock:
+        for job in running_jobs.values():
+            if job.get('number') == build_num:
+                return job
+    return None
+
+
 builds = []
-schedules = []
-
-DEFAULT_THRESHOLDS = {
-    'cpu_warning': 85,
-    'memory_warning': 80,
-    'disk_latency': 100,
-    'etcd_latency': 100,
-    'pod_density': 50,
-    'restart_count': 5,
-    'virt_handler_memory': 500
-}
 
 AVAILABLE_AGENTS = {
     'infra_agent': {
@@ -82,24 +124,12 @@ AVAILABLE_AGENTS = {
     },
 }
 
-_DEFAULT_CNV_SETTINGS = {
-    'cnv_path': '/home/kni/git/cnv-scenarios',
-    'mode': 'sanity',
-    'parallel': False,
-    'kb_log_level': '',
-    'kb_timeout': '',
-    'grafana_url': 'http://rhev-gw.rdu2.scalelab.redhat.com:3002/dashboards/f/d86573a6-d3fa-44ee-a217-550851f3e818/cnv',
-    'global_vars': {},
-    'scenario_vars': {},
-}
-
-DEFAULT_SETTINGS = {
-    'thresholds': DEFAULT_THRESHOLDS,
-    'ssh': {'host': '', 'user': 'root'},
-    'ai': {'model': 'ollama/llama3.2:3b', 'url': 'http://localhost:11434'},
-    'jira': {'projects': ['CNV', 'OCPBUGS', 'ODF'], 'scan_days': 30, 'bug_limit': 50},
-    'cnv': _DEFAULT_CNV_SETTINGS,
-}
+def _silent_unlink(path):
+    """Unlink ``path``, treating an already-missing file as success."""
+    try:
+        os.unlink(path)
+    except FileNotFoundError:
+        pass
 
 
 def _safe_remove_report(report_file):
@@ -108,54 +138,44 @@ def _safe_remove_report(report_file):
     base = os.path.basename(report_file)
     for name in (base, base.replace('.html', '.md')):
         full = os.path.realpath(os.path.join(REPORTS_DIR, name))
-        if full.startswith(os.path.realpath(REPORTS_DIR)) and os.path.exists(full):
-            os.remove(full)
-
-
-def load_settings():
-    """Load user settings from file"""
-    if os.path.exists(SETTINGS_FILE):
-        try:
-            with open(SETTINGS_FILE, 'r') as f:
-                settings = json.load(f)
-                merged = DEFAULT_SETTINGS.copy()
-                for key in settings:
-                    if isinstance(settings[key], dict):
-                        merged[key] = {**DEFAULT_SETTINGS.get(key, {}), **settings[key]}
-                    else:
-                        merged[key] = settings[key]
-                return merged
-        except (json.JSONDecodeError, OSError, ValueError):
-            pass
-    return DEFAULT_SETTINGS.copy()
-
-
-def save_settings(settings):
-    """Save user settings to file"""
-    with open(SETTINGS_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
+        if full.startswith(_REPORTS_REAL):
+            _silent_unlink(full)
+
+
+def _scenario_var_default(var_info):
+    """Form fallback for one scenario variable, pre-coerced for its type."""
+    if var_info['type'] == 'int':
+        return var_info.get('default', 0)
+    if var_info['type'] == 'bool':
+        return None
+    return str(var_info.get('default', ''))
+
+
+# (scenario id, var name, form field, type, default) for every scenario variable,
+# flattened once so a settings POST is a single walk.
+_SCENARIO_VAR_FIELDS = tuple(
+    (sid, var_name, f'cnv_var_{sid}_{var_name}', var_info['type'], _scenario_var_default(var_info))
+    for sid, scenario in CNV_SCENARIOS.items()
+    for var_name, var_info in scenario.get('variables', {}).items()
+)
 
 
 def _collect_scenario_var_defaults(form):
     """Collect per-scenario variable defaults from a settings form POST."""
     result = {}
-    for sid, scenario in CNV_SCENARIOS.items():
-        svars = scenario.get('variables', {})
-        if not svars:
-            continue
-        saved = {}
-        for var_name, var_info in svars.items():
-            key = f'cnv_var_{sid}_{var_name}'
-            if var_info['type'] == 'bool':
-                saved[var_name] = form.get(key) == 'on'
-            elif var_info['type'] == 'int':
-                try:
-                    saved[var_name] = int(form.get(key, var_info.get('default', 0)))
-                except (ValueError, TypeError):
-                    saved[var_name] = var_info.get('default', 0)
-            else:
-                saved[var_name] = form.get(key, str(var_info.get('default', ''))).strip()
-        result[sid] = saved
+    for sid, var_name, key, vtype, default in _SCENARIO_VAR_FIELDS:
+        saved = result.get(sid)
+        if saved is None:
+            saved = result[sid] = {}
+        if vtype == 'bool':
+            saved[var_name] = form.get(key) == 'on'
+        elif vtype == 'int':
+            try:
+                saved[var_name] = int(form.get(key, default))
+            except (ValueError, TypeError):
+                saved[var_name] = default
+        else:
+            saved[var_name] = form.get(key, default).strip()
     return result
 
 
@@ -166,27 +186,94 @@ def get_thresholds():
 
 
 def get_hosts_for_user(user, **_kwargs):
-    """Get all hosts — everyone can see all hosts."""
-    return Host.query.order_by(Host.created_at).all()
+    """Get all hosts — everyone can see all hosts.
+
+    Owners are joined in the same SELECT, so Host.to_dict() does not lazy-load
+    one User per distinct owner.
+    """
+    return Host.query.options(joinedload(Host.owner)).order_by(Host.created_at).all()
+
+
+HostInfo = namedtuple('HostInfo', 'host user name')
+
+_HOST_CACHE_TTL = 60
+_host_cache = {}
+_host_cache_lock = threading.Lock()
+
+
+def get_host_info(server_host):
+    """Return a session-detached HostInfo for ``server_host`` (None if unknown).
+
+    Lookups are cached for _HOST_CACHE_TTL seconds so a build start does
+    not re-query the same row; host edits call invalidate_host_cache().
+    """
+    now = time.monotonic()
+    with _host_cache_lock:
+        cached = _host_cache.get(server_host)
+    if cached and now - cached[0] < _HOST_CACHE_TTL:
+        return cached[1]
+    host_obj = Host.query.filter_by(host=server_host).first()
+    info = HostInfo(host_obj.host, host_obj.user, host_obj.name) if host_obj else None
+    with _host_cache_lock:
+        _host_cache[server_host] = (now, info)
+    return info
+
+
+_LAB_NAME_STRIP = re.compile(r'\s*\[.*?\]\s*$')
 
 
-def load_builds():
-    """Load builds from database, return as list of dicts."""
+def _clean_lab_name(host_info):
+    """Host label without its trailing ``[owner]`` tag, falling back to the address."""
+    if not host_info or not host_info.name:
+        return ''
+    return _LAB_NAME_STRIP.sub('', host_info.name).strip() or host_info.host
+
+
+def invalidate_host_cache():
+    """Drop cached HostInfo entries after hosts are added, edited or deleted."""
+    with _host_cache_lock:
+        _host_cache.clear()
+
+
+def load_builds(user_id=None, status=None):
+    """Load builds from database, return as list of dicts.
+
+    ``user_id`` / ``status`` narrow the query in SQL; only the unfiltered
+    call refreshes the module-level ``builds`` cache.
+    """
     global builds
     from app.models import Build
     import logging
+    from sqlalchemy.orm import defer
+    query = Build.query
+    if user_id is not None:
+        query = query.filter(Build.triggered_by == user_id)
+    if status:
+        query = query.filter(Build.status == status)
     try:
-        db_builds = Build.query.order_by(Build.build_number.desc()).limit(Config.MAX_BUILDS_HISTORY).all()
-        builds = [b.to_dict() for b in db_builds]
+        # List views never show the console log; leave the (large) output column unread.
+        db_builds = (query.options(defer(Build.output))
+                     .order_by(Build.build_number.desc()).limit(Config.MAX_BUILDS_HISTORY).all())
+        result = [b.to_dict(include_output=False) for b in db_builds]
     except Exception as exc:
         logging.getLogger(__name__).error("load_builds failed: %s", exc, exc_info=True)
-        builds = []
-    return builds
+        result = []
+    if user_id is None and not status:
+        builds = result
+    return result
+
+
+def find_build(build_num):
+    """Return one finished build as a dict via the build_number index, or None."""
+    from app.models import Build
+    build = Build.query.filter_by(build_number=build_num).first()
+    return build.to_dict() if build else None
 
 
 def save_build_to_db(build_record, user_id=None):
     """Save a build record to the database."""
     from app.models import db, Build
+    from app.dbutil import relaxed_commit
     build = Build(
         build_number=build_record['number'],
         name=build_record.get('name', ''),
@@ -202,7 +289,7 @@ def save_build_to_db(build_record, user_id=None):
         scheduled=build_record.get('options', {}).get('scheduled', False),
     )
     db.session.add(build)
-    db.session.commit()
+    relaxed_commit()
     return build
 
 
@@ -216,57 +303,51 @@ def get_next_build_number():
         return 1
 
 
-def load_schedules():
-    """Load schedules from file"""
-    global schedules
-    if os.path.exists(SCHEDULES_FILE):
-        try:
-            with open(SCHEDULES_FILE, 'r') as f:
-                schedules = json.load(f)
-        except (json.JSONDecodeError, OSError, ValueError):
-            schedules = []
-    return schedules
+_DAY_MAP = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
+_DAY_NAMES = {d: d.capitalize() for d in _DAY_MAP}
 
 
-def save_schedules():
-    """Save schedules to file"""
-    with open(SCHEDULES_FILE, 'w') as f:
-        json.dump(schedules, f, indent=2)
+def get_next_run_time(schedule):
+    """Calculate the next run time for a schedule.
 
+    The result only changes once per wall-clock minute (all schedule times
+    are minute-aligned), so it is memoized on the schedule's timing fields
+    plus the current minute.
+    """
+    return _next_run_time(
+        datetime.now().replace(second=0, microsecond=0),
+        schedule['type'],
+        schedule.get('scheduled_time'),
+        schedule.get('frequency', 'daily'),
+        schedule.get('time', '06:00'),
+        tuple(schedule.get('days', ['mon'])),
+        schedule.get('day_of_month', 1),
+    )
 
-def get_next_run_time(schedule):
-    """Calculate the next run time for a schedule"""
-    from datetime import timedelta
-    now = datetime.now()
 
-    if schedule['type'] == 'once':
-        scheduled_time = datetime.strptime(schedule['scheduled_time'], '%Y-%m-%d %H:%M')
+@functools.lru_cache(maxsize=256)
+def _next_run_time(now, schedule_type, scheduled_time, frequency, time_str, days, day_of_month):
+    """Pure next-run computation behind get_next_run_time (``now`` is minute-truncated)."""
+    if schedule_type == 'once':
+        scheduled_time = datetime.strptime(scheduled_time, '%Y-%m-%d %H:%M')
         if scheduled_time > now:
             return scheduled_time.strftime('%Y-%m-%d %H:%M')
         return None
 
-    frequency = schedule.get('frequency', 'daily')
-    time_str = schedule.get('time', '06:00')
-
     if frequency == 'hourly':
-        from datetime import timedelta
         next_run = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
         return next_run.strftime('%Y-%m-%d %H:%M')
 
     hour, minute = map(int, time_str.split(':'))
 
     if frequency == 'daily':
-        from datetime import timedelta
         next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
         if next_run <= now:
             next_run += timedelta(days=1)
         return next_run.strftime('%Y-%m-%d %H:%M')
 
     if frequency == 'weekly':
-        from datetime import timedelta
-        days = schedule.get('days', ['mon'])
-        day_map = {'mon': 0, 'tue': 1, 'wed': 2, 'thu': 3, 'fri': 4, 'sat': 5, 'sun': 6}
-        target_days = [day_map.get(d, 0) for d in days]
+        target_days = frozenset(_DAY_MAP.get(d, 0) for d in days)
         for i in range(7):
             check_date = now + timedelta(days=i)
             if check_date.weekday() in target_days:
@@ -276,7 +357,6 @@ def get_next_run_time(schedule):
         return None
 
     if frequency == 'monthly':
-        day_of_month = schedule.get('day_of_month', 1)
         next_run = now.replace(day=day_of_month, hour=hour, minute=minute, second=0, microsecond=0)
         if next_run <= now:
             if now.month == 12:
@@ -302,8 +382,7 @@ def get_cron_display(schedule):
         return f'Daily at {time_str}'
     elif frequency == 'weekly':
         days = schedule.get('days', ['mon'])
-        day_names = {'mon': 'Mon', 'tue': 'Tue', 'wed': 'Wed', 'thu': 'Thu', 'fri': 'Fri', 'sat': 'Sat', 'sun': 'Sun'}
-        day_list = ', '.join(day_names.get(d, d) for d in days)
+        day_list = ', '.join(_DAY_NAMES.get(d, d) for d in days)
         return f'{day_list} at {time_str}'
     elif frequency == 'monthly':
         day_of_month = schedule.get('day_of_month', 1)
@@ -313,21 +392,37 @@ def get_cron_display(schedule):
     return 'Unknown'
 
 
+
+def enriched_schedules():
+    """Return per-request copies of the schedules with ``next_run`` and
+    ``cron_display`` filled in; the shared list (which is what gets saved)
+    is never mutated."""
+    return [dict(s, next_run=get_next_run_time(s), cron_display=get_cron_display(s))
+            for s in list(load_schedules())]
+
+
 load_schedules()
 
-SUGGESTED_CHECKS_FILE = os.path.join(BASE_DIR, ".suggested_checks.json")
-suggested_checks = []
+_all_check_keys = tuple(AVAILABLE_CHECKS)
+_check_categories = tuple(sorted({c['category'] for c in AVAILABLE_CHECKS.values()}))
+
+
+def all_check_keys():
+    """Return a fresh list of every registered check key (default check selection)."""
+    return list(_all_check_keys)
+
 
+def check_categories():
+    """Return the sorted check categories (cached; refreshed by register_check)."""
+    return list(_check_categories)
 
-def load_suggested_checks():
-    global suggested_checks
-    if os.path.exists(SUGGESTED_CHECKS_FILE):
-        try:
-            with open(SUGGESTED_CHECKS_FILE, 'r') as f:
-                suggested_checks = json.load(f)
-        except Exception:
-            suggested_checks = []
-    return suggested_checks
+
+def register_check(name, entry):
+    """Add a check to AVAILABLE_CHECKS and refresh the cached key and category tuples."""
+    global _all_check_keys, _check_categories
+    AVAILABLE_CHECKS[name] = entry
+    _all_check_keys = tuple(AVAILABLE_CHECKS)
+    _check_categories = tuple(sorted({c['category'] for c in AVAILABLE_CHECKS.values()}))
 
 
 def _restore_accepted_checks():
@@ -343,14 +438,14 @@ def _restore_accepted_checks():
         name = sc.get('name', '')
         if not name or name in AVAILABLE_CHECKS:
             continue
-        AVAILABLE_CHECKS[name] = {
+        register_check(name, {
             'name': name.replace('_', ' ').title(),
             'description': sc.get('description', ''),
             'category': sc.get('category', 'Custom'),
             'default': True,
             'jira': sc.get('jira_key', ''),
             'custom': True,
-        }
+        })
         restored += 1
     if restored:
         print(f"  [Knowledge] Restored {restored} accepted Jira check(s) into AVAILABLE_CHECKS")
@@ -359,43 +454,6 @@ def _restore_accepted_checks():
 _restore_accepted_checks()
 
 
-def save_suggested_checks():
-    with open(SUGGESTED_CHECKS_FILE, 'w') as f:
-        json.dump(suggested_checks, f, indent=2)
-
-
-def extract_issues_from_output(output):
-    """Extract detected issues from health check output for learning."""
-    import re
-    issues = []
-    pod_pattern = r'[❌⚠️]\s*(\S+)/(\S+)\s+(\S+.*?)(?:\n|$)'
-    for match in re.finditer(pod_pattern, output):
-        issues.append({'type': 'pod', 'namespace': match.group(1), 'name': match.group(2), 'status': match.group(3).strip()})
-    operator_pattern = r'[❌⚠️]\s*([\w-]+)\s+(Degraded|Unavailable|Not Available)'
-    for match in re.finditer(operator_pattern, output, re.IGNORECASE):
-        issues.append({'type': 'operator', 'name': match.group(1), 'status': match.group(2)})
-    migration_pattern = r'migration.*?(failed|stuck|error)'
-    for match in re.finditer(migration_pattern, output, re.IGNORECASE):
-        issues.append({'type': 'migration', 'name': 'vm-migration', 'status': match.group(1)})
-    storage_pattern = r'(pvc|volume|storage|odf).*?(pending|failed|error|not ready)'
-    for match in re.finditer(storage_pattern, output, re.IGNORECASE):
-        issues.append({'type': 'storage', 'name': match.group(1), 'status': match.group(2)})
-    node_pattern = r'node[s]?\s+(\S+)\s+(NotReady|SchedulingDisabled)'
-    for match in re.finditer(node_pattern, output, re.IGNORECASE):
-        issues.append({'type': 'node', 'name': match.group(1), 'status': match.group(2)})
-    if 'OOMKilled' in output or 'oom' in output.lower():
-        issues.append({'type': 'resource', 'name': 'oom-event', 'status': 'OOMKilled'})
-
-    seen = set()
-    unique_issues = []
-    for issue in issues:
-        key = (issue['type'], issue.get('name', ''), issue.get('namespace', ''))
-        if key not in seen:
-            seen.add(key)
-            unique_issues.append(issue)
-    return unique_issues
-
-
 from . import views  # noqa: F401
 from . import build_api  # noqa: F401
 from . import build_executor  # noqa: F401
@@ -1,9 +1,10 @@
 """Status and management API routes."""
 import os
+import select
 import signal
 import subprocess
 import time
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 from flask import jsonify, request
 from flask_login import current_user, login_required
@@ -12,81 +13,125 @@ from app.decorators import admin_required, log_audit, operator_required
 
 from app.routes import (
     dashboard_bp,
-    builds,
-    load_builds,
+    fast_jsonify,
+    find_running_job,
+    get_full_output,
+    get_output,
     queued_jobs,
     running_jobs,
     _jobs_lock,
+    _log,
+    _ts,
     save_build_to_db,
     _safe_remove_report,
 )
 from app.routes.build_executor import _start_next_queued
 
+# Report unlinks are filesystem-latency bound; bulk deletes fan them out here.
+_report_unlink_pool = ThreadPoolExecutor(max_workers=16, thread_name_prefix='report-unlink')
+
+
+def _wait_for_exit(process, timeout):
+    """Wait up to ``timeout`` seconds for ``process`` to exit; True if it did.
+
+    Where the platform has pidfds, sleep in poll() until the exit instead
+    of the sleep/poll loop behind ``Popen.wait(timeout=...)``. poll() rather
+    than select(), which rejects descriptors >= FD_SETSIZE.
+    """
+    pidfd_open = getattr(os, 'pidfd_open', None)
+    if pidfd_open is not None:
+        # The build thread may reap the child at any moment, after which its
+        # pid can be recycled: check right before opening the pidfd, and again
+        # after, so we never wait on (and then SIGKILL for) an unrelated process.
+        if process.poll() is not None:
+            return True
+        try:
+            fd = pidfd_open(process.pid)
+        except OSError:  # already reaped, or the kernel lacks pidfd support
+            pass
+        else:
+            try:
+                if process.poll() is not None:
+                    return True
+                poller = select.poll()
+                poller.register(fd, select.POLLIN)
+                if not poller.poll(timeout * 1000):
+                    return False
+            finally:
+                os.close(fd)
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return False
+    return True
+
 @dashboard_bp.route('/api/status')
 @login_required
 def api_status():
     """API endpoint for build status - returns all running builds."""
+    # Snapshot the registry under the lock; output joins and JSON encoding happen after release.
     with _jobs_lock:
-        if running_jobs:
-            # Return info about all running builds
-            all_running = []
-            for job_id, job in running_jobs.items():
-                all_running.append({
-                    'job_id': job_id,
-                    'number': job.get('number'),
-                    'name': job.get('name', ''),
-                    'output': job.get('output', ''),
-                    'progress': job.get('progress', 0),
-                    'phases': job.get('phases', []),
-                    'current_phase': job.get('current_phase', ''),
-                    'start_time': job.get('start_time', 0),
-                    'triggered_by': job.get('triggered_by', 'system'),
-                })
-
-            # For backward compatibility, also return first build's data at top level
-            first = all_running[0] if all_running else {}
-            return jsonify({
-                'running': True,
-                'builds': all_running,
-                'queued': len(queued_jobs),
-                'output': first.get('output', ''),
-                'progress': first.get('progress', 0),
-                'phases': first.get('phases', []),
-                'current_phase': first.get('current_phase', ''),
-                'start_time': first.get('start_time', 0),
+        jobs = list(running_jobs.items())
+        queued = len(queued_jobs)
+    if jobs:
+        # Return info about all running builds
+        all_running = []
+        for job_id, job in jobs:
+            all_running.append({
+                'job_id': job_id,
+                'number': job.get('number'),
+                'name': job.get('name', ''),
+                'output': get_output(job),
+                'progress': job.get('progress', 0),
+                'phases': job.get('phases', []),
+                'current_phase': job.get('current_phase', ''),
+                'start_time': job.get('start_time', 0),
+                'triggered_by': job.get('triggered_by', 'system'),
             })
-    return jsonify({'running': False, 'queued': len(queued_jobs)})
+
+        # For backward compatibility, also return first build's data at top level
+        first = all_running[0] if all_running else {}
+        return fast_jsonify({
+            'running': True,
+            'builds': all_running,
+            'queued': queued,
+            'output': first.get('output', ''),
+            'progress': first.get('progress', 0),
+            'phases': first.get('phases', []),
+            'current_phase': first.get('current_phase', ''),
+            'start_time': first.get('start_time', 0),
+        })
+    return fast_jsonify({'running': False, 'queued': queued})
 
 
 @dashboard_bp.route('/api/test-progress/<int:build_num>')
 @login_required
 def api_test_progress(build_num):
     """API endpoint for per-test live progress of a running build."""
-    with _jobs_lock:
-        for job_id, job in running_jobs.items():
-            if job.get('number') == build_num:
-                tp = job.get('test_progress', {})
-                # For running tests, compute elapsed time
-                now = time.time()
-                result = {}
-                for tname, info in tp.items():
-                    entry = dict(info)
-                    if entry['status'] == 'running' and entry.get('start_time'):
-                        elapsed = int(now - entry['start_time'])
-                        entry['elapsed'] = f"{elapsed // 60}m {elapsed % 60}s"
-                    result[tname] = entry
-                return jsonify({
-                    'running': True,
-                    'build_num': build_num,
-                    'test_progress': result,
-                    'current_phase': job.get('current_phase', ''),
-                    'progress': job.get('progress', 0),
-                })
+    job = find_running_job(build_num)
+    if job is not None:
+        tp = job.get('test_progress', {})
+        # For running tests, compute elapsed time
+        now = time.time()
+        result = {}
+        for tname, info in list(tp.items()):
+            entry = dict(info)
+            if entry['status'] == 'running' and entry.get('start_time'):
+                elapsed = int(now - entry['start_time'])
+                entry['elapsed'] = f"{elapsed // 60}m {elapsed % 60}s"
+            result[tname] = entry
+        return jsonify({
+            'running': True,
+            'build_num': build_num,
+            'test_progress': result,
+            'current_phase': job.get('current_phase', ''),
+            'progress': job.get('progress', 0),
+        })
     # Not running — check completed builds
-    load_builds()
-    build = next((b for b in builds if b.get('number') == build_num), None)
-    if build:
-        return jsonify({'running': False, 'build_num': build_num, 'status': build.get('status', 'unknown')})
+    from app.models import db, Build
+    row = db.session.query(Build.status).filter_by(build_number=build_num).first()
+    if row:
+        return jsonify({'running': False, 'build_num': build_num, 'status': row.status})
     return jsonify({'running': False, 'build_num': build_num, 'status': 'not_found'}), 404
 
 
@@ -97,21 +142,22 @@ def api_stop():
     data = request.get_json(silent=True) or {}
     target_job_id = data.get('job_id')
 
+    # Only the registry lookup needs the lock; responses are built after release.
     with _jobs_lock:
-        if not running_jobs:
-            return jsonify({'success': False, 'error': 'No running build'})
-
         # If no specific job_id, stop the first one (backward compat)
         if not target_job_id:
-            target_job_id = list(running_jobs.keys())[0]
+            target_job_id = next(iter(running_jobs), None)
+        job = running_jobs.get(target_job_id) if target_job_id else None
+        have_running = bool(running_jobs)
 
-        job = running_jobs.get(target_job_id)
-        if not job:
-            return jsonify({'success': False, 'error': 'Build not found'})
+    if not have_running:
+        return jsonify({'success': False, 'error': 'No running build'})
+    if not job:
+        return jsonify({'success': False, 'error': 'Build not found'})
 
-        # Only owner or admin can stop
-        if not current_user.is_admin and job.get('user_id') != current_user.id:
-            return jsonify({'success': False, 'error': 'You can only stop your own builds.'})
+    # Only owner or admin can stop
+    if not current_user.is_admin and job.get('user_id') != current_user.id:
+        return jsonify({'success': False, 'error': 'You can only stop your own builds.'})
 
     try:
         process = job.get('process')
@@ -119,15 +165,13 @@ def api_stop():
             try:
                 pgid = os.getpgid(process.pid)
                 os.killpg(pgid, signal.SIGTERM)
-                try:
-                    process.wait(timeout=5)
-                except subprocess.TimeoutExpired:
+                if not _wait_for_exit(process, 5):
                     os.killpg(pgid, signal.SIGKILL)
-                    process.wait(timeout=2)
+                    _wait_for_exit(process, 2)
             except (ProcessLookupError, OSError):
                 pass
 
-        job['output'] += f'\n[{datetime.now().strftime("%H:%M:%S")}] ⛔ Build stopped by {current_user.username}\n'
+        _log(job, f'\n[{_ts()}] ⛔ Build stopped by {current_user.username}\n')
         job['current_phase'] = f'Stopped by {current_user.username}'
 
         for phase in job.get('phases', []):
@@ -145,9 +189,9 @@ def api_stop():
             'checks': job.get('checks', []),
             'checks_count': job.get('checks_count', 0),
             'options': job.get('options', {}),
-            'timestamp': job['timestamp'],
+            'timestamp': job.get('timestamp', ''),
             'duration': duration,
-            'output': job['output'],
+            'output': get_full_output(job),
             'report_file': None
         }
 
@@ -213,15 +257,12 @@ def api_delete_bulk():
         else:
             return jsonify({'success': False, 'error': 'Invalid filter type'})
 
-        builds_to_delete = query.all()
-        deleted_count = 0
-
-        for build in builds_to_delete:
-            report_file = build.report_file
-            if report_file:
-                _safe_remove_report(report_file)
-            db.session.delete(build)
-            deleted_count += 1
+        # Only the report paths are needed from the rows; the delete itself is one statement.
+        report_files = [rf for (rf,) in query.with_entities(Build.report_file).filter(Build.report_file.isnot(None)) if rf]
+        unlinks = _report_unlink_pool.map(_safe_remove_report, report_files)
+        deleted_count = query.delete(synchronize_session=False)
+        for _ in unlinks:  # wait for the unlinks (re-raising any failure) before committing
+            pass
 
         db.session.commit()
         log_audit('build_bulk_delete', details=f'Deleted {deleted_count} builds (filter: {filter_type})')
@@ -4,11 +4,11 @@ from datetime import datetime
 from flask import redirect, request, url_for
 from flask_login import current_user
 
-from config.settings import AVAILABLE_CHECKS, CNV_SCENARIOS, Config
+from config.settings import CNV_SCENARIOS, Config
 
 from app.decorators import operator_required
 
-from app.routes import dashboard_bp, get_thresholds, schedules, save_schedules
+from app.routes import add_schedule, all_check_keys, dashboard_bp, get_thresholds, save_schedules
 from app.routes.build_executor import start_build
 
 @dashboard_bp.route('/job/run', methods=['POST'])
@@ -117,7 +117,7 @@ def run_build():
     else:
         selected_checks = request.form.getlist('checks')
         if not selected_checks:
-            selected_checks = list(AVAILABLE_CHECKS.keys())
+            selected_checks = all_check_keys()
 
         rca_level = request.form.get('rca_level', 'none')
 
@@ -176,7 +176,7 @@ def run_build():
                 'created_by': current_user.username if current_user.is_authenticated else 'system',
                 'last_run': None
             }
-            schedules.append(schedule)
+            add_schedule(schedule)
             save_schedules()
             return redirect(url_for('dashboard.schedules_page'))
 
@@ -210,7 +210,7 @@ def run_build():
             cron_expr = request.form.get('recurring_cron', '0 6 * * *')
             schedule['cron'] = cron_expr
 
-        schedules.append(schedule)
+        add_schedule(schedule)
         save_schedules()
         return redirect(url_for('dashboard.schedules_page'))
 
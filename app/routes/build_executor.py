@@ -1,12 +1,11 @@
 """Build queue and background execution (_execute_build)."""
 import os
-import re
+import queue
 import sys
 import threading
 import time
 from datetime import datetime
-
-from app.models import Host
+from itertools import chain
 
 from healthchecks.cnv_report import (
     generate_cnv_report_html,
@@ -14,36 +13,147 @@ from healthchecks.cnv_report import (
     parse_cnv_results,
 )
 
+from app import create_app
+from app.learning import record_health_check_run
+from app.models import User
 from app.routes import (
     CNV_SCRIPT_PATH,
     MAX_CONCURRENT,
-    REPORTS_DIR,
     SCRIPT_PATH,
+    _clean_lab_name,
+    close_output_log,
     extract_issues_from_output,
+    has_issue_candidates,
+    get_host_info,
     get_next_build_number,
+    get_full_output,
+    new_output,
+    new_output_log,
     queued_jobs,
     running_jobs,
     _jobs_lock,
+    _log,
+    _ts,
     save_build_to_db,
 )
 
 from app.routes.build_custom_checks import run_custom_checks
-from app.routes.build_phases import find_phase_idx, run_primary_phases
+from app.routes.settings_routes import _send_cnv_email_report
+from app.routes.build_phases import (
+    _ERROR_MARKERS,
+    _ISSUE_MARKERS,
+    _has_any,
+    find_phase_idx,
+    finish_phases,
+    run_primary_phases,
+    write_report,
+)
 from config.settings import Config
 
+# Reusable daemon workers for run_job: a finished build's thread picks up the
+# next build instead of a fresh Thread being spawned per build. Workers stay
+# daemonic (unlike ThreadPoolExecutor's) so shutdown never waits on a build.
+_build_tasks = queue.SimpleQueue()
+_build_pool_lock = threading.Lock()
+_idle_build_workers = 0
+
+
+def _build_worker():
+    """Run queued build callables forever, marking this worker idle between them."""
+    global _idle_build_workers
+    while True:
+        task = _build_tasks.get()
+        try:
+            task()
+        except Exception as e:
+            print(f'[Builds] Worker error: {e}')
+        task = None  # release the finished build's job (and its log file) while idle
+        with _build_pool_lock:
+            _idle_build_workers += 1
+
+
+def _submit_build_task(task):
+    """Hand ``task`` to an idle build worker, starting a new one only if none is idle."""
+    global _idle_build_workers
+    with _build_pool_lock:
+        if _idle_build_workers:
+            _idle_build_workers -= 1
+        else:
+            threading.Thread(target=_build_worker, name='healthcrew-build', daemon=True).start()
+        _build_tasks.put(task)
+
 
 def _pending_phase(name):
+    """New phase entry; a plain dict because /api/status serves job phases as JSON."""
     return {'name': name, 'status': 'pending', 'start_time': None, 'duration': None}
 
 
+def _rca_phase_names(options, rca_level):
+    """Optional RCA phases, in run order, for the selected RCA level and sources."""
+    if rca_level == 'none':
+        return []
+    names = []
+    if options.get('rca_jira') or rca_level == 'full':
+        names.append('Search Jira')
+    if options.get('rca_email') or rca_level == 'full':
+        names.append('Search Email')
+    if options.get('rca_web'):
+        names.append('Search Web')
+    if rca_level == 'full':
+        names.append('Deep RCA')
+    return names
+
+
+def _reserve_slot(job_id, build_num, user_id):
+    """Claim a running slot for job_id. Caller must hold _jobs_lock.
+
+    The capacity check and this insert happen in one critical section, so
+    concurrent starts cannot overshoot MAX_CONCURRENT. _execute_build fills
+    the placeholder in place; readers only ever see a job with defaults, and
+    the defaults cover every key api_stop needs to record a stopped build.
+    """
+    running_jobs[job_id] = {
+        'number': build_num,
+        'name': '',
+        'status': 'running',
+        'status_text': 'Starting',
+        'checks': [],
+        'checks_count': 0,
+        'options': {},
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M'),
+        'output': new_output(),
+        'output_log': new_output_log(),
+        'output_lock': threading.Lock(),
+        'progress': 0,
+        'phases': [],
+        'current_phase': 'Starting...',
+        'start_time': time.time(),
+        'user_id': user_id,
+        'test_progress': {},
+    }
+
+
+def _launch_reserved(job_id, build_num, checks, options, user_id, username):
+    """Run _execute_build for a reserved slot, releasing the slot if the build fails to start."""
+    try:
+        _execute_build(job_id, build_num, checks, options, user_id=user_id, username=username)
+    except Exception:
+        with _jobs_lock:
+            job = running_jobs.pop(job_id, None)
+        if job is not None:
+            close_output_log(job)
+        raise
+
+
 def _start_next_queued():
     """Start the next queued build if a slot is available. Must NOT hold _jobs_lock."""
     with _jobs_lock:
         if len(running_jobs) >= MAX_CONCURRENT or not queued_jobs:
             return
-        job_id, checks, options, user_id = queued_jobs.pop(0)
+        job_id, build_num, checks, options, user_id, username = queued_jobs.popleft()
+        _reserve_slot(job_id, build_num, user_id)
 
-    _execute_build(job_id, checks, options, user_id=user_id)
+    _launch_reserved(job_id, build_num, checks, options, user_id, username)
 
 
 def start_build(checks, options, user_id=None):
@@ -53,36 +163,30 @@ def start_build(checks, options, user_id=None):
 
     username = 'system'
     if user_id:
-        from app.models import User
         user = User.query.get(user_id)
         if user:
             username = user.username
 
     with _jobs_lock:
         if len(running_jobs) >= MAX_CONCURRENT:
-            queued_jobs.append((job_id, checks, options, user_id))
+            queued_jobs.append((job_id, build_num, checks, options, user_id, username))
             return build_num
+        _reserve_slot(job_id, build_num, user_id)
 
-    _execute_build(job_id, checks, options, user_id=user_id)
+    _launch_reserved(job_id, build_num, checks, options, user_id, username)
     return build_num
 
 
-def _execute_build(job_id, checks, options, user_id=None):
-    """Actually run the build in a background thread."""
-    build_num = int(job_id.split('_')[1])
+def _execute_build(job_id, build_num, checks, options, user_id=None, username='system'):
+    """Actually run the build in a background thread (job_id's slot is already reserved).
 
-    username = 'system'
-    if user_id:
-        try:
-            from app.models import User
-            user = User.query.get(user_id)
-            if user:
-                username = user.username
-        except Exception:
-            pass
+    ``build_num`` and ``username`` are resolved once by start_build and carried
+    through the queue.
+    """
 
     is_cnv = options.get('task_type') == 'cnv_scenarios'
     is_combined = options.get('task_type') == 'cnv_combined'
+    lab_name = ''
 
     if is_cnv or is_combined:
         cmd = [sys.executable, CNV_SCRIPT_PATH]
@@ -90,10 +194,9 @@ def _execute_build(job_id, checks, options, user_id=None):
         if server_host:
             options['server_host'] = server_host
             cmd.extend(['--server', server_host])
-            host_obj = Host.query.filter_by(host=server_host).first()
-            if host_obj and host_obj.name:
-                clean_name = re.sub(r'\s*\[.*?\]\s*$', '', host_obj.name).strip() or host_obj.host
-                cmd.extend(['--lab-name', clean_name])
+            lab_name = _clean_lab_name(get_host_info(server_host))
+            if lab_name:
+                cmd.extend(['--lab-name', lab_name])
 
         scenario_tests = options.get('scenario_tests', [])
         tests_str = ','.join(scenario_tests) if scenario_tests else 'all'
@@ -114,33 +217,19 @@ def _execute_build(job_id, checks, options, user_id=None):
             cmd.extend(['--timeout', options['kb_timeout']])
 
         if is_combined:
-            rca_level = options.get('rca_level', 'none')
-            phases = [
-                _pending_phase('Initialize'), _pending_phase('Connect'), _pending_phase('Verify Setup'),
-                _pending_phase('Run Scenarios'), _pending_phase('Collect Results'),
-                _pending_phase('Scenario Summary'), _pending_phase('Health Check'), _pending_phase('Health Report'),
+            phase_names = [
+                'Initialize', 'Connect', 'Verify Setup', 'Run Scenarios', 'Collect Results',
+                'Scenario Summary', 'Health Check', 'Health Report',
+                *_rca_phase_names(options, options.get('rca_level', 'none')),
+                *(['Cleanup'] if options.get('combined_cleanup') else []),
+                'Generate Report',
             ]
-            if rca_level != 'none':
-                if options.get('rca_jira') or rca_level == 'full':
-                    phases.append(_pending_phase('Search Jira'))
-                if options.get('rca_email') or rca_level == 'full':
-                    phases.append(_pending_phase('Search Email'))
-                if options.get('rca_web'):
-                    phases.append(_pending_phase('Search Web'))
-                if rca_level == 'full':
-                    phases.append(_pending_phase('Deep RCA'))
-            if options.get('combined_cleanup'):
-                phases.append(_pending_phase('Cleanup'))
-            phases.append(_pending_phase('Generate Report'))
-            if options.get('email'):
-                phases.append(_pending_phase('Send Email'))
         else:
-            phases = [
-                _pending_phase('Initialize'), _pending_phase('Connect'), _pending_phase('Verify Setup'),
-                _pending_phase('Run Scenarios'), _pending_phase('Collect Results'), _pending_phase('Summary'),
+            phase_names = [
+                'Initialize', 'Connect', 'Verify Setup', 'Run Scenarios', 'Collect Results', 'Summary',
             ]
-            if options.get('email'):
-                phases.append(_pending_phase('Send Email'))
+        if options.get('email'):
+            phase_names.append('Send Email')
 
     else:
         cmd = [sys.executable, SCRIPT_PATH]
@@ -149,10 +238,9 @@ def _execute_build(job_id, checks, options, user_id=None):
         if server_host:
             options['server_host'] = server_host
             cmd.extend(['--server', server_host])
-            host_obj = Host.query.filter_by(host=server_host).first()
-            if host_obj and host_obj.name:
-                clean_name = re.sub(r'\s*\[.*?\]\s*$', '', host_obj.name).strip() or host_obj.host
-                cmd.extend(['--lab-name', clean_name])
+            lab_name = _clean_lab_name(get_host_info(server_host))
+            if lab_name:
+                cmd.extend(['--lab-name', lab_name])
 
         rca_level = options.get('rca_level', 'none')
         if rca_level == 'bugs':
@@ -171,39 +259,18 @@ def _execute_build(job_id, checks, options, user_id=None):
             if options.get('email_to'):
                 cmd.extend(['--email-to', options.get('email_to')])
 
-        phases = [_pending_phase('Initialize')]
-        if options.get('jira'):
-            phases.append(_pending_phase('Scan Jira'))
-
-        phases.extend([
-            _pending_phase('Connect'), _pending_phase('Collect Data'), _pending_phase('Console Report'),
-            _pending_phase('Analyze'), _pending_phase('Generate Report'),
-        ])
-
-        rca_phase_idx = len(phases) - 1
-        if rca_level != 'none':
-            if options.get('rca_jira') or rca_level == 'full':
-                phases.insert(rca_phase_idx, _pending_phase('Search Jira'))
-                rca_phase_idx += 1
-            if options.get('rca_email') or rca_level == 'full':
-                phases.insert(rca_phase_idx, _pending_phase('Search Email'))
-                rca_phase_idx += 1
-            if options.get('rca_web'):
-                phases.insert(rca_phase_idx, _pending_phase('Search Web'))
-                rca_phase_idx += 1
-            if rca_level == 'full':
-                phases.insert(rca_phase_idx, _pending_phase('Deep RCA'))
+        phase_names = [
+            'Initialize',
+            *(['Scan Jira'] if options.get('jira') else []),
+            'Connect', 'Collect Data', 'Console Report', 'Analyze',
+            *_rca_phase_names(options, rca_level),
+            'Generate Report',
+            *(['Send Email'] if options.get('email') else []),
+        ]
 
-        if options.get('email'):
-            phases.append(_pending_phase('Send Email'))
+    phases = [_pending_phase(name) for name in phase_names]
 
     run_name = options.get('run_name', '')
-    server_host = options.get('server_host', '')
-    lab_name = ''
-    if server_host:
-        host_obj = Host.query.filter_by(host=server_host).first()
-        if host_obj and host_obj.name:
-            lab_name = re.sub(r'\s*\[.*?\]\s*$', '', host_obj.name).strip()
     if run_name and lab_name:
         display_name = f'{run_name} ({lab_name})'
     elif lab_name:
@@ -211,14 +278,12 @@ def _execute_build(job_id, checks, options, user_id=None):
     else:
         display_name = run_name
 
-    job = {
+    job = running_jobs[job_id]
+    job.update({
         'number': build_num,
         'name': display_name,
         'status': 'running',
         'status_text': 'Running',
-        'output': f'[{datetime.now().strftime("%H:%M:%S")}] Starting build #{build_num}'
-        + (f' "{run_name}"' if run_name else '')
-        + f' (by {username})...\n',
         'checks': checks,
         'checks_count': len(checks),
         'options': options,
@@ -227,17 +292,21 @@ def _execute_build(job_id, checks, options, user_id=None):
         'start_time': time.time(),
         'progress': 5,
         'phases': phases,
+        'phase_index': {p['name']: i for i, p in enumerate(phases)},
         'current_phase': 'Initializing...',
         'triggered_by': username,
         'user_id': user_id,
         'test_progress': {},
-    }
-
-    with _jobs_lock:
-        running_jobs[job_id] = job
+    })
+    _log(
+        job,
+        f'[{_ts()}] Starting build #{build_num}'
+        + (f' "{run_name}"' if run_name else '')
+        + f' (by {username})...\n',
+    )
 
     def set_phase(job, index, status, phase_name=None):
-        if index < len(job['phases']):
+        if index < len(job['phases']) and job['phases'][index]['status'] != status:
             phase = job['phases'][index]
             now = time.time()
             if status == 'running' and phase['start_time'] is None:
@@ -247,10 +316,9 @@ def _execute_build(job_id, checks, options, user_id=None):
             phase['status'] = status
         if phase_name:
             job['current_phase'] = phase_name
-            job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] ▶ {phase_name}\n'
+            _log(job, f'[{_ts()}] ▶ {phase_name}\n')
 
     def run_job():
-        from app import create_app
         app = create_app()
         report_file = None
 
@@ -259,14 +327,14 @@ def _execute_build(job_id, checks, options, user_id=None):
             if is_cnv or is_combined:
                 tests_list = options.get('scenario_tests', [])
                 task_label = 'CNV Combined' if is_combined else 'CNV Scenarios'
-                job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Task: {task_label} ({options.get("scenario_mode", "sanity")} mode)\n'
-                job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Tests: {len(tests_list)} selected\n'
+                _log(job, f'[{_ts()}] Task: {task_label} ({options.get("scenario_mode", "sanity")} mode)\n')
+                _log(job, f'[{_ts()}] Tests: {len(tests_list)} selected\n')
                 if is_combined:
-                    job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Pipeline: Scenarios → Health Check → {"Cleanup" if options.get("combined_cleanup") else "No Cleanup"}\n'
+                    _log(job, f'[{_ts()}] Pipeline: Scenarios → Health Check → {"Cleanup" if options.get("combined_cleanup") else "No Cleanup"}\n')
             else:
-                job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Options: RCA={options.get("rca_level")}, Jira={options.get("jira")}, Email={options.get("email")}\n'
-                job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Checks: {len(checks)} selected\n'
-            job['output'] += '-' * 60 + '\n'
+                _log(job, f'[{_ts()}] Options: RCA={options.get("rca_level")}, Jira={options.get("jira")}, Email={options.get("email")}\n')
+                _log(job, f'[{_ts()}] Checks: {len(checks)} selected\n')
+            _log(job, '-' * 60 + '\n')
             job['progress'] = 5
             set_phase(job, 0, 'done')
 
@@ -285,6 +353,7 @@ def _execute_build(job_id, checks, options, user_id=None):
                 is_combined=is_combined,
                 phases=phases,
                 phase_idx_box=phase_idx_box,
+                lab_name=lab_name,
             )
             return_code = outcome['return_code']
             full_output = outcome['full_output']
@@ -306,37 +375,26 @@ def _execute_build(job_id, checks, options, user_id=None):
                 cnv_cluster_info = None
 
             if is_cnv:
-                summary_lines = [
-                    l
-                    for l in full_output.split('\n')
-                    if 'PASSED:' in l and 'FAILED:' in l and 'TOTAL:' in l
-                ]
-                if summary_lines:
-                    import re as _re
-
-                    m = _re.search(
-                        r'PASSED:\s*(\d+)\s*\|\s*FAILED:\s*(\d+)\s*\|\s*TOTAL:\s*(\d+)',
-                        summary_lines[-1],
-                    )
-                    if m:
-                        n_passed, n_failed = int(m.group(1)), int(m.group(2))
-                        if return_code != 0 and n_passed == 0:
-                            status, status_text = 'failed', 'Failed'
-                        elif n_failed > 0 and n_passed > 0:
-                            status, status_text = 'unstable', 'Partial Pass'
-                        elif n_failed > 0:
-                            status, status_text = 'failed', 'Failed'
-                        else:
-                            status, status_text = 'success', 'All Passed'
+                try:
+                    cnv_results_final = parse_cnv_results(full_output)
+                except Exception:
+                    cnv_results_final = None
+                summary = cnv_results_final['summary'] if cnv_results_final else None
+                if summary:
+                    n_passed, n_failed = summary['passed'], summary['failed']
+                    if return_code != 0 and n_passed == 0:
+                        status, status_text = 'failed', 'Failed'
+                    elif n_failed > 0 and n_passed > 0:
+                        status, status_text = 'unstable', 'Partial Pass'
+                    elif n_failed > 0:
+                        status, status_text = 'failed', 'Failed'
                     else:
-                        status = 'failed' if return_code != 0 else 'success'
-                        status_text = 'Failed' if return_code != 0 else 'All Passed'
+                        status, status_text = 'success', 'All Passed'
                 else:
                     status = 'failed' if return_code != 0 else 'success'
                     status_text = 'Failed' if return_code != 0 else 'All Passed'
 
                 try:
-                    cnv_results_final = parse_cnv_results(full_output)
                     cnv_cluster_info = parse_cluster_info(full_output)
                     ts_str = datetime.now().strftime('%Y-%m-%d_%H-%M-%S')
                     report_filename = f'cnv_report_{ts_str}.html'
@@ -354,23 +412,15 @@ def _execute_build(job_id, checks, options, user_id=None):
                         cluster_info=cnv_cluster_info,
                         run_config=options,
                     )
-                    os.makedirs(REPORTS_DIR, exist_ok=True)
-                    report_path = os.path.join(REPORTS_DIR, report_filename)
-                    with open(report_path, 'w', encoding='utf-8') as f:
-                        f.write(report_html)
+                    write_report(report_filename, report_html)
                     report_file = report_filename
-                    job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Reports saved: {report_filename}\n'
+                    _log(job, f'[{_ts()}] Reports saved: {report_filename}\n')
                 except Exception as e:
-                    job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Report generation failed: {e}\n'
+                    _log(job, f'[{_ts()}] Report generation failed: {e}\n')
 
             elif not is_combined:
-                has_issues = (
-                    'WARNING' in full_output
-                    or 'Issues:' in full_output
-                    or 'ISSUES' in full_output
-                    or '⚠️' in full_output
-                )
-                has_errors = 'ERROR' in full_output or 'CRITICAL' in full_output or '❌' in full_output
+                has_issues = _has_any(full_output, _ISSUE_MARKERS)
+                has_errors = _has_any(full_output, _ERROR_MARKERS)
                 if return_code != 0 or has_errors:
                     status = 'failed'
                     status_text = 'Failed'
@@ -387,27 +437,29 @@ def _execute_build(job_id, checks, options, user_id=None):
                     cc_ids = options.get('scenario_custom_checks', [])
                 elif is_combined:
                     cc_ids = list(
-                        set(
-                            options.get('hc_custom_checks', [])
-                            + options.get('scenario_custom_checks', [])
+                        dict.fromkeys(
+                            chain(
+                                options.get('hc_custom_checks', ()),
+                                options.get('scenario_custom_checks', ()),
+                            )
                         )
                     )
                 else:
                     cc_ids = options.get('custom_checks', [])
 
                 if cc_ids:
-                    custom_check_results = run_custom_checks(
-                        job, options, cc_ids, label='Custom Health Checks'
-                    )
+                    with app.app_context():
+                        custom_check_results = run_custom_checks(
+                            job, options, cc_ids, label='Custom Health Checks'
+                        )
                     cc_failed = [r for r in custom_check_results if not r['passed']]
                     if cc_failed and status == 'success':
                         status = 'unstable'
                         status_text = status_text + ' (custom check issues)'
             except Exception as e:
-                job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Custom check execution error: {e}\n'
+                _log(job, f'[{_ts()}] Custom check execution error: {e}\n')
 
-            for i in range(current_phase_idx, len(phases)):
-                set_phase(job, i, 'done')
+            finish_phases(job, range(current_phase_idx, len(phases)))
             job['progress'] = 100
 
             build_record = {
@@ -420,16 +472,17 @@ def _execute_build(job_id, checks, options, user_id=None):
                 'options': options,
                 'timestamp': job['timestamp'],
                 'duration': duration,
-                'output': job['output'],
+                'output': get_full_output(job),
                 'report_file': report_file,
                 'custom_check_results': custom_check_results,
             }
 
             with app.app_context():
                 save_build_to_db(build_record, user_id=user_id)
-                if not is_cnv and not is_combined:
+                # Not gated on has_issues/has_errors: node NotReady, OOM and PVC Pending
+                # lines carry no WARNING/ERROR marker but are still learned from.
+                if not is_cnv and not is_combined and has_issue_candidates(full_output):
                     try:
-                        from app.learning import record_health_check_run
                         detected_issues = extract_issues_from_output(full_output)
                         if detected_issues:
                             record_health_check_run(detected_issues)
@@ -439,12 +492,10 @@ def _execute_build(job_id, checks, options, user_id=None):
                 if (is_cnv or is_combined) and options.get('email'):
                     if not options.get('email_to'):
                         options['email_to'] = Config.DEFAULT_EMAIL
-                    email_phase_idx = find_phase_idx(phases, 'Send Email')
+                    email_phase_idx = find_phase_idx(job, 'Send Email')
                     if email_phase_idx is not None and email_phase_idx >= 0:
                         set_phase(job, email_phase_idx, 'running', 'Sending email report...')
                     try:
-                        from app.routes.settings_routes import _send_cnv_email_report
-
                         _email_cluster_info = (
                             cnv_cluster_info
                             if is_cnv
@@ -465,16 +516,16 @@ def _execute_build(job_id, checks, options, user_id=None):
                             else (cnv_results if is_combined else None),
                             cluster_info=_email_cluster_info,
                         )
-                        job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Email sent to {options["email_to"]}\n'
+                        _log(job, f'[{_ts()}] Email sent to {options["email_to"]}\n')
                         if email_phase_idx is not None and email_phase_idx >= 0:
                             set_phase(job, email_phase_idx, 'done', 'Email sent!')
                     except Exception as e:
-                        job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Email failed: {e}\n'
+                        _log(job, f'[{_ts()}] Email failed: {e}\n')
                         if email_phase_idx is not None and email_phase_idx >= 0:
                             set_phase(job, email_phase_idx, 'done', f'Email failed: {e}')
 
         except Exception as e:
-            job['output'] += f'\n[{datetime.now().strftime("%H:%M:%S")}] ❌ Error: {str(e)}\n'
+            _log(job, f'\n[{_ts()}] ❌ Error: {str(e)}\n')
             duration_secs = int(time.time() - job['start_time'])
             duration = f'{duration_secs // 60}m {duration_secs % 60}s'
 
@@ -488,16 +539,16 @@ def _execute_build(job_id, checks, options, user_id=None):
                 'options': options,
                 'timestamp': job['timestamp'],
                 'duration': duration,
-                'output': job['output'],
+                'output': get_full_output(job),
                 'report_file': None,
             }
             with app.app_context():
                 save_build_to_db(build_record, user_id=user_id)
         finally:
+            close_output_log(job)
             with _jobs_lock:
                 if job_id in running_jobs:
                     del running_jobs[job_id]
             _start_next_queued()
 
-    thread = threading.Thread(target=run_job, daemon=True)
-    thread.start()
+    _submit_build_task(run_job)
@@ -1,13 +1,9 @@
 """CNV and health-check subprocess phase orchestration."""
 import os
-import re
-import subprocess
 import sys
 import time
 from datetime import datetime
 
-from app.models import Host
-
 from config.settings import Config
 from healthchecks.cnv_report import (
     generate_combined_report_html,
@@ -15,200 +11,200 @@ from healthchecks.cnv_report import (
     parse_cnv_results,
 )
 
+from app.routes import _log, _ts
+from app.routes.build_stream import stream_subprocess
+
 BASE_DIR = Config.BASE_DIR
 REPORTS_DIR = Config.REPORTS_DIR
 SCRIPT_PATH = os.path.join(BASE_DIR, 'healthchecks', 'hybrid_health_check.py')
 
+_BANNER = '=' * 60
+
+# Output markers used to classify a finished run. Plain substring tests are
+# kept on purpose: str.__contains__ is a vectorised fastsearch and beats an
+# alternation regex over multi-MB output.
+_ISSUE_MARKERS = ('WARNING', 'Issues:', 'ISSUES', '⚠️')
+_HC_ISSUE_MARKERS = ('WARNING', 'Issues:', '⚠️')
+_ERROR_MARKERS = ('ERROR', 'CRITICAL', '❌')
+
+# Stdout keyword -> phase tables: (keyword, phase name, message, progress[, combined progress]).
+# Order matters: the first keyword found in a line wins. 'Summary' is 'Scenario Summary' in
+# combined runs.
+_CNV_PHASE_TABLE = (
+    ('Connecting to', 'Connect', 'Connecting to jump host...', 10, 10),
+    ('Connected to', 'Connect', 'Connected to jump host', 15, 15),
+    ('SSH connection established', 'Connect', 'Connected to jump host', 15, 15),
+    ('CONNECTION ERROR', 'Connect', '❌ Connection failed!', 15, 15),
+    ('SSH connection failed', 'Connect', '❌ Connection failed!', 15, 15),
+    ('Connection refused', 'Connect', '❌ Connection refused!', 15, 15),
+    ('Verifying cnv-scenarios', 'Verify Setup', 'Verifying cnv-scenarios setup...', 20, 20),
+    ('KUBECONFIG', 'Verify Setup', 'Setting up environment...', 22, 22),
+    ('kubeconfig', 'Verify Setup', 'Setting up environment...', 22, 22),
+    ('Running command', 'Run Scenarios', 'Running workload scenarios...', 30, 30),
+    ('run-workloads.sh', 'Run Scenarios', 'Running workload scenarios...', 30, 30),
+    ('Running test', 'Run Scenarios', 'Running test scenarios...', 35, 35),
+    ('RUNNING', 'Run Scenarios', 'Running scenarios...', 40, 40),
+    ('kube-burner', 'Run Scenarios', 'Running kube-burner workloads...', 50, 50),
+    ('Waiting for', 'Run Scenarios', 'Waiting for workloads...', 55, 55),
+    ('PASS', 'Run Scenarios', 'Tests progressing...', 60, 30),
+    ('FAIL', 'Run Scenarios', 'Tests progressing...', 60, 30),
+    ('Collecting results', 'Collect Results', 'Collecting results...', 75, 35),
+    ('summary.json', 'Collect Results', 'Parsing summary...', 80, 38),
+    ('Results:', 'Summary', 'Generating summary...', 85, 40),
+    ('Summary:', 'Summary', 'Generating summary...', 85, 40),
+    ('SUMMARY', 'Summary', 'Generating summary...', 85, 40),
+    ('scenarios complete', 'Summary', 'Scenarios done!', 95, 42),
+    ('All tests', 'Summary', 'Scenarios done!', 95, 42),
+    ('CNV Scenarios finished', 'Summary', 'Scenarios done!', 95, 42),
+)
 
-def find_phase_idx(phases, name):
-    for i, p in enumerate(phases):
-        if p['name'] == name:
-            return i
-    return -1
+_HEALTH_PHASE_TABLE = (
+    ('Checking Jira for new test suggestions', 'Scan Jira', 'Scanning Jira for new tests...', 3),
+    ('Checking Jira for recent bugs', 'Scan Jira', 'Checking Jira for bugs...', 4),
+    ('Analyzed', 'Scan Jira', 'Analyzing Jira bugs...', 5),
+    ('new checks will be included', 'Scan Jira', 'Jira scan complete', 6),
+    ('HealthCrew AI Starting', 'Connect', 'Initializing...', 8),
+    ('Connecting to cluster', 'Connect', 'Connecting to cluster...', 10),
+    ('Connected to', 'Connect', 'Connected to cluster', 15),
+    ('CONNECTION ERROR', 'Connect', '❌ Connection failed!', 15),
+    ('SSH connection failed', 'Connect', '❌ Connection failed!', 15),
+    ('host unreachable', 'Connect', '❌ Host unreachable!', 15),
+    ('Authentication failed', 'Connect', '❌ Authentication failed!', 15),
+    ('oc.*not responding', 'Connect', '❌ oc CLI not configured!', 15),
+    ('cluster is not configured', 'Connect', '❌ Cluster not configured!', 15),
+    ('Collecting cluster data', 'Collect Data', 'Collecting cluster data...', 18),
+    ('Checking nodes', 'Collect Data', 'Checking nodes...', 22),
+    ('Checking node resources', 'Collect Data', 'Checking node resources...', 25),
+    ('Getting cluster version', 'Collect Data', 'Getting cluster version...', 28),
+    ('Checking etcd', 'Collect Data', 'Checking etcd health...', 30),
+    ('Checking certificates', 'Collect Data', 'Checking certificates...', 32),
+    ('Checking PVC', 'Collect Data', 'Checking PVC status...', 35),
+    ('Checking VM migrations', 'Collect Data', 'Checking VM migrations...', 38),
+    ('Checking alerts', 'Collect Data', 'Checking alerts...', 40),
+    ('Checking CSI', 'Collect Data', 'Checking CSI drivers...', 42),
+    ('Checking OOM', 'Collect Data', 'Checking OOM events...', 44),
+    ('Checking virt-handler', 'Collect Data', 'Checking virt-handler pods...', 46),
+    ('Checking virt-launcher', 'Collect Data', 'Checking virt-launcher pods...', 48),
+    ('Checking DataVolumes', 'Collect Data', 'Checking DataVolumes...', 50),
+    ('Checking HyperConverged', 'Collect Data', 'Checking HyperConverged...', 52),
+    ('Data collection complete', 'Collect Data', 'Data collection complete', 54),
+    ('Generating console report', 'Console Report', 'Generating console report...', 56),
+    ('HEALTH REPORT', 'Console Report', 'Displaying health report...', 58),
+    ('Starting Root Cause Analysis', 'Analyze', 'Starting root cause analysis...', 60),
+    ('🔬 Starting Root Cause Analysis', 'Analyze', 'Starting root cause analysis...', 60),
+    ('Matching failures to known issues', 'Analyze', 'Matching failures to known issues...', 62),
+    ('issue(s) to analyze', 'Analyze', 'Analyzing issues...', 64),
+    ('→ Searching Jira', 'Search Jira', 'Searching Jira for bugs...', 66),
+    ('Searching Jira for related bugs', 'Search Jira', 'Searching Jira for bugs...', 66),
+    ('→ Searching emails', 'Search Email', 'Searching emails...', 70),
+    ('Searching emails for related', 'Search Email', 'Searching emails...', 70),
+    ('→ Searching web', 'Search Web', 'Searching web docs...', 74),
+    ('Running deep investigation', 'Deep RCA', 'Running deep investigation...', 78),
+    ('Deep investigation complete', 'Deep RCA', 'Deep investigation complete', 82),
+    ('Saving HTML report', 'Generate Report', 'Saving HTML report...', 85),
+    ('Saved:', 'Generate Report', 'Report saved', 88),
+    ('Reports saved', 'Generate Report', 'Reports saved', 90),
+    ('Health check complete', 'Generate Report', 'Complete!', 95),
+    ('Sending email report', 'Send Email', 'Sending email...', 96),
+    ('Email sent successfully', 'Send Email', 'Email sent!', 99),
+)
 
 
-def stream_subprocess(job, set_phase, sub_cmd, sub_keywords, phase_idx_box):
-    """Stream subprocess stdout; phase_idx_box[0] tracks current phase index. Returns (rc, lines)."""
-    current_phase_idx = phase_idx_box[0]
-    sub_process = subprocess.Popen(
-        sub_cmd,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.STDOUT,
-        stdin=subprocess.PIPE,
-        text=True,
-        cwd=BASE_DIR,
-        bufsize=1,
-        start_new_session=True,
-    )
-    job['process'] = sub_process
-    _re_test_start = re.compile(r'\[(\S+)\]\s+Starting test')
-    _re_test_complete = re.compile(r'\[(\S+)\]\s+Completed:\s+exit_code=(\d+),\s+duration=(.*)')
-    _re_test_queued = re.compile(r'\[(\S+)\]\s+Queued for')
-
-    sub_lines = []
-    while True:
-        line = sub_process.stdout.readline()
-        if not line and sub_process.poll() is not None:
-            break
-        if line:
-            sub_lines.append(line)
-            timestamp = datetime.now().strftime('%H:%M:%S')
-            job['output'] += f'[{timestamp}] {line}'
-
-            m_queued = _re_test_queued.search(line)
-            if m_queued:
-                tname = m_queued.group(1)
-                if tname not in job['test_progress']:
-                    job['test_progress'][tname] = {
-                        'status': 'queued',
-                        'start_time': None,
-                        'duration': None,
-                        'exit_code': None,
-                    }
-
-            m_start = _re_test_start.search(line)
-            if m_start:
-                tname = m_start.group(1)
-                job['test_progress'][tname] = {
-                    'status': 'running',
-                    'start_time': time.time(),
-                    'duration': None,
-                    'exit_code': None,
-                }
-
-            m_done = _re_test_complete.search(line)
-            if m_done:
-                tname = m_done.group(1)
-                ec = int(m_done.group(2))
-                dur_str = m_done.group(3).strip()
-                tp = job['test_progress'].get(tname, {})
-                tp['status'] = 'passed' if ec == 0 else 'failed'
-                tp['exit_code'] = ec
-                tp['duration'] = dur_str
-                job['test_progress'][tname] = tp
-
-            for keyword, (phase_idx, phase_msg, progress) in sub_keywords.items():
-                if keyword in line and phase_idx >= 0:
-                    if phase_idx > current_phase_idx:
-                        set_phase(job, current_phase_idx, 'done')
-                        for skip_idx in range(current_phase_idx + 1, phase_idx):
-                            if job['phases'][skip_idx]['status'] == 'pending':
-                                job['phases'][skip_idx]['status'] = 'skipped'
-                        current_phase_idx = phase_idx
-                        phase_idx_box[0] = current_phase_idx
-                        set_phase(job, phase_idx, 'running', phase_msg)
-                    job['progress'] = progress
-                    job['current_phase'] = phase_msg
-                    break
-    rc = sub_process.wait()
-    phase_idx_box[0] = current_phase_idx
-    return rc, sub_lines
+# Health-check step of a combined build, same layout as _HEALTH_PHASE_TABLE; the RCA
+# rows are appended only when an RCA level is selected.
+_COMBINED_HC_PHASE_TABLE = (
+    ('HealthCrew AI Starting', 'Health Check', 'Health check initializing...', 52),
+    ('Connecting to cluster', 'Health Check', 'Health check connecting...', 54),
+    ('Connected to', 'Health Check', 'Health check connected', 55),
+    ('Collecting cluster data', 'Health Check', 'Collecting cluster data...', 58),
+    ('Checking nodes', 'Health Check', 'Checking nodes...', 60),
+    ('Checking node resources', 'Health Check', 'Checking resources...', 62),
+    ('Data collection complete', 'Health Check', 'Data collection done', 65),
+    ('Generating console report', 'Health Check', 'Generating console report...', 67),
+    ('HEALTH REPORT', 'Health Check', 'Displaying health report...', 70),
+    ('Saving HTML report', 'Health Report', 'Saving health report...', 72),
+    ('Saved:', 'Health Report', 'Health report saved', 74),
+    ('Reports saved', 'Health Report', 'Health reports saved', 75),
+    ('Health check complete', 'Health Report', 'Health check done!', 78),
+)
+_COMBINED_RCA_PHASE_TABLE = (
+    ('Starting Root Cause Analysis', 'Health Report', 'Starting root cause analysis...', 73),
+    ('🔬 Starting Root Cause Analysis', 'Health Report', 'Starting root cause analysis...', 73),
+    ('Matching failures to known issues', 'Health Report', 'Matching failures...', 74),
+    ('issue(s) to analyze', 'Health Report', 'Analyzing issues...', 75),
+    ('→ Searching Jira', 'Search Jira', 'Searching Jira for bugs...', 76),
+    ('Searching Jira for related bugs', 'Search Jira', 'Searching Jira for bugs...', 76),
+    ('→ Searching emails', 'Search Email', 'Searching emails...', 77),
+    ('Searching emails for related', 'Search Email', 'Searching emails...', 77),
+    ('→ Searching web', 'Search Web', 'Searching web docs...', 78),
+    ('Running deep investigation', 'Deep RCA', 'Running deep investigation...', 79),
+    ('Deep investigation complete', 'Deep RCA', 'Deep investigation complete', 80),
+)
 
+# Phases run_primary_phases looks up by name in a combined build.
+_COMBINED_PHASE_NAMES = (
+    'Scenario Summary', 'Health Check', 'Health Report',
+    'Search Jira', 'Search Email', 'Search Web', 'Deep RCA',
+    'Cleanup', 'Generate Report',
+)
 
-def build_cnv_scenario_keywords(job, is_combined):
-    phases = job['phases']
-    connect_idx = find_phase_idx(phases, 'Connect')
-    verify_idx = find_phase_idx(phases, 'Verify Setup')
-    run_idx = find_phase_idx(phases, 'Run Scenarios')
-    results_idx = find_phase_idx(phases, 'Collect Results')
-    summary_idx = find_phase_idx(phases, 'Scenario Summary' if is_combined else 'Summary')
-    pr = 60 if not is_combined else 30
-    colp, sump, smzp, donp = (
-        (75, 80, 85, 95) if not is_combined else (35, 38, 40, 42)
-    )
-    return {
-        'Connecting to': (connect_idx, 'Connecting to jump host...', 10),
-        'Connected to': (connect_idx, 'Connected to jump host', 15),
-        'SSH connection established': (connect_idx, 'Connected to jump host', 15),
-        'CONNECTION ERROR': (connect_idx, '❌ Connection failed!', 15),
-        'SSH connection failed': (connect_idx, '❌ Connection failed!', 15),
-        'Connection refused': (connect_idx, '❌ Connection refused!', 15),
-        'Verifying cnv-scenarios': (verify_idx, 'Verifying cnv-scenarios setup...', 20),
-        'KUBECONFIG': (verify_idx, 'Setting up environment...', 22),
-        'kubeconfig': (verify_idx, 'Setting up environment...', 22),
-        'Running command': (run_idx, 'Running workload scenarios...', 30),
-        'run-workloads.sh': (run_idx, 'Running workload scenarios...', 30),
-        'Running test': (run_idx, 'Running test scenarios...', 35),
-        'RUNNING': (run_idx, 'Running scenarios...', 40),
-        'kube-burner': (run_idx, 'Running kube-burner workloads...', 50),
-        'Waiting for': (run_idx, 'Waiting for workloads...', 55),
-        'PASS': (run_idx, 'Tests progressing...', pr),
-        'FAIL': (run_idx, 'Tests progressing...', pr),
-        'Collecting results': (results_idx, 'Collecting results...', colp),
-        'summary.json': (results_idx, 'Parsing summary...', sump),
-        'Results:': (summary_idx, 'Generating summary...', smzp),
-        'Summary:': (summary_idx, 'Generating summary...', smzp),
-        'SUMMARY': (summary_idx, 'Generating summary...', smzp),
-        'scenarios complete': (summary_idx, 'Scenarios done!', donp),
-        'All tests': (summary_idx, 'Scenarios done!', donp),
-        'CNV Scenarios finished': (summary_idx, 'Scenarios done!', donp),
-    }
 
+def finish_phases(job, indices):
+    """Mark the phases at ``indices`` done in one pass, timing them against a single clock read.
 
-def build_health_check_keywords(job):
+    Same per-phase effect as set_phase(job, i, 'done'); phases already done keep their duration.
+    """
     phases = job['phases']
-    scan_jira_idx = find_phase_idx(phases, 'Scan Jira')
-    connect_idx = find_phase_idx(phases, 'Connect')
-    collect_idx = find_phase_idx(phases, 'Collect Data')
-    console_idx = find_phase_idx(phases, 'Console Report')
-    analyze_idx = find_phase_idx(phases, 'Analyze')
-    jira_rca_idx = find_phase_idx(phases, 'Search Jira')
-    email_rca_idx = find_phase_idx(phases, 'Search Email')
-    web_rca_idx = find_phase_idx(phases, 'Search Web')
-    deep_rca_idx = find_phase_idx(phases, 'Deep RCA')
-    report_idx = find_phase_idx(phases, 'Generate Report')
-    email_idx = find_phase_idx(phases, 'Send Email')
+    now = time.time()
+    for i in indices:
+        phase = phases[i]
+        if phase['status'] == 'done':
+            continue
+        if phase['start_time'] is not None:
+            phase['duration'] = round(now - phase['start_time'], 1)
+        phase['status'] = 'done'
+
+
+def _has_any(text, markers):
+    """True if any of ``markers`` occurs in ``text``."""
+    return any(marker in text for marker in markers)
 
-    return {
-        'Checking Jira for new test suggestions': (scan_jira_idx, 'Scanning Jira for new tests...', 3),
-        'Checking Jira for recent bugs': (scan_jira_idx, 'Checking Jira for bugs...', 4),
-        'Analyzed': (scan_jira_idx, 'Analyzing Jira bugs...', 5),
-        'new checks will be included': (scan_jira_idx, 'Jira scan complete', 6),
-        'HealthCrew AI Starting': (connect_idx, 'Initializing...', 8),
-        'Connecting to cluster': (connect_idx, 'Connecting to cluster...', 10),
-        'Connected to': (connect_idx, 'Connected to cluster', 15),
-        'CONNECTION ERROR': (connect_idx, '❌ Connection failed!', 15),
-        'SSH connection failed': (connect_idx, '❌ Connection failed!', 15),
-        'host unreachable': (connect_idx, '❌ Host unreachable!', 15),
-        'Authentication failed': (connect_idx, '❌ Authentication failed!', 15),
-        'oc.*not responding': (connect_idx, '❌ oc CLI not configured!', 15),
-        'cluster is not configured': (connect_idx, '❌ Cluster not configured!', 15),
-        'Collecting cluster data': (collect_idx, 'Collecting cluster data...', 18),
-        'Checking nodes': (collect_idx, 'Checking nodes...', 22),
-        'Checking node resources': (collect_idx, 'Checking node resources...', 25),
-        'Getting cluster version': (collect_idx, 'Getting cluster version...', 28),
-        'Checking etcd': (collect_idx, 'Checking etcd health...', 30),
-        'Checking certificates': (collect_idx, 'Checking certificates...', 32),
-        'Checking PVC': (collect_idx, 'Checking PVC status...', 35),
-        'Checking VM migrations': (collect_idx, 'Checking VM migrations...', 38),
-        'Checking alerts': (collect_idx, 'Checking alerts...', 40),
-        'Checking CSI': (collect_idx, 'Checking CSI drivers...', 42),
-        'Checking OOM': (collect_idx, 'Checking OOM events...', 44),
-        'Checking virt-handler': (collect_idx, 'Checking virt-handler pods...', 46),
-        'Checking virt-launcher': (collect_idx, 'Checking virt-launcher pods...', 48),
-        'Checking DataVolumes': (collect_idx, 'Checking DataVolumes...', 50),
-        'Checking HyperConverged': (collect_idx, 'Checking HyperConverged...', 52),
-        'Data collection complete': (collect_idx, 'Data collection complete', 54),
-        'Generating console report': (console_idx, 'Generating console report...', 56),
-        'HEALTH REPORT': (console_idx, 'Displaying health report...', 58),
-        'Starting Root Cause Analysis': (analyze_idx, 'Starting root cause analysis...', 60),
-        '🔬 Starting Root Cause Analysis': (analyze_idx, 'Starting root cause analysis...', 60),
-        'Matching failures to known issues': (analyze_idx, 'Matching failures to known issues...', 62),
-        'issue(s) to analyze': (analyze_idx, 'Analyzing issues...', 64),
-        '→ Searching Jira': (jira_rca_idx, 'Searching Jira for bugs...', 66),
-        'Searching Jira for related bugs': (jira_rca_idx, 'Searching Jira for bugs...', 66),
-        '→ Searching emails': (email_rca_idx, 'Searching emails...', 70),
-        'Searching emails for related': (email_rca_idx, 'Searching emails...', 70),
-        '→ Searching web': (web_rca_idx, 'Searching web docs...', 74),
-        'Running deep investigation': (deep_rca_idx, 'Running deep investigation...', 78),
-        'Deep investigation complete': (deep_rca_idx, 'Deep investigation complete', 82),
-        'Saving HTML report': (report_idx, 'Saving HTML report...', 85),
-        'Saved:': (report_idx, 'Report saved', 88),
-        'Reports saved': (report_idx, 'Reports saved', 90),
-        'Health check complete': (report_idx, 'Complete!', 95),
-        'Sending email report': (email_idx, 'Sending email...', 96),
-        'Email sent successfully': (email_idx, 'Email sent!', 99),
-    }
+
+def find_phase_idx(job, name):
+    """Index of the named phase in job['phases'], or -1 if this build has no such phase."""
+    return job['phase_index'].get(name, -1)
+
+
+def write_report(filename, html):
+    """Write an HTML report into REPORTS_DIR as one encoded blob (a large write bypasses the file buffer)."""
+    data = html.encode('utf-8')
+    with open(os.path.join(REPORTS_DIR, filename), 'wb') as f:
+        f.write(data)
+
+
+def _log_banner(job, title):
+    """Log ``title`` framed by '=' rules as one chunk under a single timestamp."""
+    ts = _ts()
+    _log(job, f'\n[{ts}] {_BANNER}\n[{ts}] {title}\n[{ts}] {_BANNER}\n')
+
+
+def build_cnv_scenario_keywords(job, is_combined):
+    summary_name = 'Scenario Summary' if is_combined else 'Summary'
+    keywords = {}
+    for keyword, phase_name, msg, progress, combined_progress in _CNV_PHASE_TABLE:
+        idx = find_phase_idx(job, summary_name if phase_name == 'Summary' else phase_name)
+        if idx >= 0:
+            keywords[keyword] = (idx, msg, combined_progress if is_combined else progress)
+    return keywords
+
+
+def build_health_check_keywords(job):
+    keywords = {}
+    for keyword, phase_name, msg, progress in _HEALTH_PHASE_TABLE:
+        idx = find_phase_idx(job, phase_name)
+        if idx >= 0:
+            keywords[keyword] = (idx, msg, progress)
+    return keywords
 
 
 def run_primary_phases(
@@ -224,8 +220,13 @@ def run_primary_phases(
     is_combined,
     phases,
     phase_idx_box,
+    lab_name='',
 ):
-    """Run subprocess pipeline for CNV-only, health-only, or combined tasks; returns result dict."""
+    """Run subprocess pipeline for CNV-only, health-only, or combined tasks; returns result dict.
+
+    ``lab_name`` is the cleaned Host label the caller resolved for options['server_host'];
+    this runs on the build thread, outside any app context, so it must not query.
+    """
     if is_cnv or is_combined:
         cnv_scenario_keywords = build_cnv_scenario_keywords(job, is_combined)
     else:
@@ -239,17 +240,16 @@ def run_primary_phases(
     report_file = None
 
     if is_combined:
+        pidx = {name: find_phase_idx(job, name) for name in _COMBINED_PHASE_NAMES}
+
         # Step 1: scenarios (cleanup=false)
-        job['output'] += f'\n[{datetime.now().strftime("%H:%M:%S")}] {"="*60}\n'
-        job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] PHASE 1: Running CNV Scenarios (cleanup=false)\n'
-        job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] {"="*60}\n'
+        _log_banner(job, 'PHASE 1: Running CNV Scenarios (cleanup=false)')
 
-        scenario_rc, scenario_lines = stream_subprocess(
+        scenario_rc, scenario_output, _ = stream_subprocess(
             job, set_phase, cmd, cnv_scenario_keywords, phase_idx_box
         )
-        scenario_output = ''.join(scenario_lines)
 
-        s_summary_idx = find_phase_idx(phases, 'Scenario Summary')
+        s_summary_idx = pidx['Scenario Summary']
         if s_summary_idx >= 0:
             set_phase(job, s_summary_idx, 'done')
 
@@ -260,25 +260,21 @@ def run_primary_phases(
             pass
 
         # Step 2: health check
-        hc_phase_idx = find_phase_idx(phases, 'Health Check')
-        hr_phase_idx = find_phase_idx(phases, 'Health Report')
+        hc_phase_idx = pidx['Health Check']
+        hr_phase_idx = pidx['Health Report']
         set_phase(job, hc_phase_idx, 'running', 'Running health check...')
         current_phase_idx = hc_phase_idx
         phase_idx_box[0] = current_phase_idx
         job['progress'] = 50
 
-        job['output'] += f'\n[{datetime.now().strftime("%H:%M:%S")}] {"="*60}\n'
-        job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] PHASE 2: Running Health Check\n'
-        job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] {"="*60}\n'
+        _log_banner(job, 'PHASE 2: Running Health Check')
 
         hc_cmd = [sys.executable, SCRIPT_PATH]
         server_host = options.get('server_host', '')
         if server_host:
             hc_cmd.extend(['--server', server_host])
-            host_obj = Host.query.filter_by(host=server_host).first()
-            if host_obj and host_obj.name:
-                clean_name = re.sub(r'\s*\[.*?\]\s*$', '', host_obj.name).strip() or host_obj.host
-                hc_cmd.extend(['--lab-name', clean_name])
+            if lab_name:
+                hc_cmd.extend(['--lab-name', lab_name])
 
         rca_level = options.get('rca_level', 'none')
         if rca_level == 'bugs':
@@ -297,69 +293,31 @@ def run_primary_phases(
                 hc_cmd.extend(['--email-to', options.get('email_to')])
 
         hc_keywords = {
-            'HealthCrew AI Starting': (hc_phase_idx, 'Health check initializing...', 52),
-            'Connecting to cluster': (hc_phase_idx, 'Health check connecting...', 54),
-            'Connected to': (hc_phase_idx, 'Health check connected', 55),
-            'Collecting cluster data': (hc_phase_idx, 'Collecting cluster data...', 58),
-            'Checking nodes': (hc_phase_idx, 'Checking nodes...', 60),
-            'Checking node resources': (hc_phase_idx, 'Checking resources...', 62),
-            'Data collection complete': (hc_phase_idx, 'Data collection done', 65),
-            'Generating console report': (hc_phase_idx, 'Generating console report...', 67),
-            'HEALTH REPORT': (hc_phase_idx, 'Displaying health report...', 70),
-            'Saving HTML report': (hr_phase_idx, 'Saving health report...', 72),
-            'Saved:': (hr_phase_idx, 'Health report saved', 74),
-            'Reports saved': (hr_phase_idx, 'Health reports saved', 75),
-            'Health check complete': (hr_phase_idx, 'Health check done!', 78),
+            keyword: (pidx[phase_name], msg, progress)
+            for keyword, phase_name, msg, progress in (
+                _COMBINED_HC_PHASE_TABLE + (_COMBINED_RCA_PHASE_TABLE if rca_level != 'none' else ())
+            )
         }
 
-        rca_level = options.get('rca_level', 'none')
-        if rca_level != 'none':
-            jira_rca_idx = find_phase_idx(phases, 'Search Jira')
-            email_rca_idx = find_phase_idx(phases, 'Search Email')
-            web_rca_idx = find_phase_idx(phases, 'Search Web')
-            deep_rca_idx = find_phase_idx(phases, 'Deep RCA')
-
-            hc_keywords.update({
-                'Starting Root Cause Analysis': (hr_phase_idx, 'Starting root cause analysis...', 73),
-                '🔬 Starting Root Cause Analysis': (hr_phase_idx, 'Starting root cause analysis...', 73),
-                'Matching failures to known issues': (hr_phase_idx, 'Matching failures...', 74),
-                'issue(s) to analyze': (hr_phase_idx, 'Analyzing issues...', 75),
-                '→ Searching Jira': (jira_rca_idx, 'Searching Jira for bugs...', 76),
-                'Searching Jira for related bugs': (jira_rca_idx, 'Searching Jira for bugs...', 76),
-                '→ Searching emails': (email_rca_idx, 'Searching emails...', 77),
-                'Searching emails for related': (email_rca_idx, 'Searching emails...', 77),
-                '→ Searching web': (web_rca_idx, 'Searching web docs...', 78),
-                'Running deep investigation': (deep_rca_idx, 'Running deep investigation...', 79),
-                'Deep investigation complete': (deep_rca_idx, 'Deep investigation complete', 80),
-            })
-
-        hc_rc, hc_lines = stream_subprocess(job, set_phase, hc_cmd, hc_keywords, phase_idx_box)
-        health_output = ''.join(hc_lines)
+        hc_rc, health_output, health_report_file = stream_subprocess(
+            job, set_phase, hc_cmd, hc_keywords, phase_idx_box
+        )
         set_phase(job, hr_phase_idx, 'done')
 
-        for rca_name in ('Search Jira', 'Search Email', 'Search Web', 'Deep RCA'):
-            rca_idx = find_phase_idx(phases, rca_name)
-            if rca_idx >= 0:
-                set_phase(job, rca_idx, 'done')
-
-        health_report_file = None
-        for hl in hc_lines:
-            match = re.search(r'(health_report_\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}\.html)', hl)
-            if match:
-                health_report_file = match.group(1)
+        finish_phases(job, [
+            pidx[name] for name in ('Search Jira', 'Search Email', 'Search Web', 'Deep RCA') if pidx[name] >= 0
+        ])
 
         cleanup_rc = 0
         cleanup_output = ''
         if options.get('combined_cleanup'):
-            cleanup_phase_idx = find_phase_idx(phases, 'Cleanup')
+            cleanup_phase_idx = pidx['Cleanup']
             set_phase(job, cleanup_phase_idx, 'running', 'Cleaning up test resources...')
             current_phase_idx = cleanup_phase_idx
             phase_idx_box[0] = current_phase_idx
             job['progress'] = 80
 
-            job['output'] += f'\n[{datetime.now().strftime("%H:%M:%S")}] {"="*60}\n'
-            job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] PHASE 3: Cleanup (cleanup=true)\n'
-            job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] {"="*60}\n'
+            _log_banner(job, 'PHASE 3: Cleanup (cleanup=true)')
 
             cleanup_cmd = list(cmd) + ['--cleanup-only']
             cleanup_keywords = {
@@ -372,13 +330,12 @@ def run_primary_phases(
                 'CLEANUP FAILED': (cleanup_phase_idx, 'Cleanup failed!', 90),
             }
 
-            cleanup_rc, cleanup_lines = stream_subprocess(
+            cleanup_rc, cleanup_output, _ = stream_subprocess(
                 job, set_phase, cleanup_cmd, cleanup_keywords, phase_idx_box
             )
-            cleanup_output = ''.join(cleanup_lines)
             set_phase(job, cleanup_phase_idx, 'done')
 
-        gen_phase_idx = find_phase_idx(phases, 'Generate Report')
+        gen_phase_idx = pidx['Generate Report']
         set_phase(job, gen_phase_idx, 'running', 'Generating combined report...')
         current_phase_idx = gen_phase_idx
         phase_idx_box[0] = current_phase_idx
@@ -386,10 +343,11 @@ def run_primary_phases(
 
         full_output = scenario_output + '\n' + health_output + '\n' + cleanup_output
 
-        has_scenario_fail = scenario_rc != 0 or ('FAIL' in scenario_output and 'PASS' not in scenario_output)
-        has_scenario_partial = 'FAIL' in scenario_output and 'PASS' in scenario_output
-        has_hc_issues = 'WARNING' in health_output or 'Issues:' in health_output or '⚠️' in health_output
-        has_hc_errors = 'ERROR' in health_output or 'CRITICAL' in health_output or '❌' in health_output
+        scenario_has_fail = 'FAIL' in scenario_output
+        has_scenario_partial = scenario_has_fail and 'PASS' in scenario_output
+        has_scenario_fail = scenario_rc != 0 or (scenario_has_fail and not has_scenario_partial)
+        has_hc_issues = _has_any(health_output, _HC_ISSUE_MARKERS)
+        has_hc_errors = _has_any(health_output, _ERROR_MARKERS)
 
         if scenario_rc != 0 and hc_rc != 0:
             status = 'failed'
@@ -434,14 +392,11 @@ def run_primary_phases(
                 cluster_info=combined_cluster_info,
                 run_config=options,
             )
-            os.makedirs(REPORTS_DIR, exist_ok=True)
-            report_path = os.path.join(REPORTS_DIR, report_filename)
-            with open(report_path, 'w', encoding='utf-8') as f:
-                f.write(report_html)
+            write_report(report_filename, report_html)
             report_file = report_filename
-            job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Reports saved: {report_filename}\n'
+            _log(job, f'[{_ts()}] Reports saved: {report_filename}\n')
         except Exception as e:
-            job['output'] += f'[{datetime.now().strftime("%H:%M:%S")}] Report generation failed: {e}\n'
+            _log(job, f'[{_ts()}] Report generation failed: {e}\n')
 
         set_phase(job, gen_phase_idx, 'done')
         job['progress'] = 95
@@ -464,27 +419,18 @@ def run_primary_phases(
 
     # Single task: CNV only or health only
     active_keywords = cnv_scenario_keywords if is_cnv else health_check_keywords
-    return_code, stdout_lines = stream_subprocess(
+    return_code, full_output, health_report = stream_subprocess(
         job, set_phase, cmd, active_keywords, phase_idx_box
     )
     current_phase_idx = phase_idx_box[0]
-    report_file = None
-
-    if not is_cnv:
-        for sl in stdout_lines:
-            if 'Report saved' in sl or 'health_report_' in sl:
-                match = re.search(r'(health_report_\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}\.html)', sl)
-                if match:
-                    report_file = match.group(1)
+    report_file = None if is_cnv else health_report
 
-    for i in range(current_phase_idx, len(phases)):
-        set_phase(job, i, 'done')
+    finish_phases(job, range(current_phase_idx, len(phases)))
 
     job['progress'] = 100
 
     duration_secs = int(time.time() - job['start_time'])
     duration = f'{duration_secs // 60}m {duration_secs % 60}s'
-    full_output = ''.join(stdout_lines)
 
     return {
         'return_code': return_code,
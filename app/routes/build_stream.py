@@ -0,0 +1,172 @@
+"""Build subprocess streaming: pipe reader, per-test progress and stdout keyword matching."""
+import fcntl
+import io
+import os
+import re
+import subprocess
+import time
+from functools import lru_cache
+
+from config.settings import Config
+
+from app.routes import _log, _ts
+
+try:
+    import ahocorasick
+except ImportError:  # optional C accelerator; the regex prefilter below is used instead
+    ahocorasick = None
+
+BASE_DIR = Config.BASE_DIR
+
+_TEST_START_RE = re.compile(r'\[(\S+)\]\s+Starting test')
+_TEST_COMPLETE_RE = re.compile(r'\[(\S+)\]\s+Completed:\s+exit_code=(\d+),\s+duration=(.*)')
+_TEST_QUEUED_RE = re.compile(r'\[(\S+)\]\s+Queued for')
+_HEALTH_REPORT_RE = re.compile(r'health_report_\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}\.html')
+_READ_SIZE = 65536
+_PIPE_SIZE = 1 << 20
+
+
+@lru_cache(maxsize=32)
+def _keyword_matcher(keywords):
+    """Return match(line) -> position in ``keywords`` of the first keyword found in line, or None.
+
+    Uses a pyahocorasick automaton (one pass, independent of keyword count)
+    when installed, otherwise one compiled alternation. Earlier keywords win
+    either way: the regex hit's own rank bounds the substring scan, so only
+    keywords ranked ahead of it are rechecked.
+    """
+    if not keywords:
+        return lambda line: None
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for rank, keyword in enumerate(keywords):
+            automaton.add_word(keyword, rank)
+        automaton.make_automaton()
+        return lambda line: min((rank for _end, rank in automaton.iter(line)), default=None)
+
+    pattern = re.compile('|'.join(re.escape(k) for k in keywords))
+    rank_of = {keyword: rank for rank, keyword in enumerate(keywords)}
+
+    def match(line):
+        m = pattern.search(line)
+        if not m:
+            return None
+        hit = rank_of[m.group()]
+        return next((rank for rank in range(hit) if keywords[rank] in line), hit)
+
+    return match
+
+
+def _test_entry(status, start_time=None):
+    """Per-test progress record for job['test_progress'] (JSON-served by /api/test-progress)."""
+    return {'status': status, 'start_time': start_time, 'duration': None, 'exit_code': None}
+
+
+def _split_output(data):
+    """Decode a chunk of child stdout, translating newlines like text-mode pipes; returns (text, lines)."""
+    text = data.decode('utf-8', 'replace').replace('\r\n', '\n').replace('\r', '\n')
+    lines = text.split('\n')
+    tail = lines.pop()
+    lines = [line + '\n' for line in lines]
+    if tail:
+        lines.append(tail)
+    return text, lines
+
+
+def stream_subprocess(job, set_phase, sub_cmd, sub_keywords, phase_idx_box):
+    """Stream subprocess stdout; phase_idx_box[0] tracks current phase index.
+
+    Returns (rc, text, health_report) where health_report is the last
+    health_report_*.html filename printed, or None. stdout is drained from
+    the raw pipe in _READ_SIZE chunks and only complete lines are decoded;
+    the decoded text goes into one StringIO rather than a list of lines.
+    """
+    current_phase_idx = phase_idx_box[0]
+    sub_process = subprocess.Popen(
+        sub_cmd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        stdin=subprocess.PIPE,
+        cwd=BASE_DIR,
+        bufsize=0,
+        start_new_session=True,
+    )
+    job['process'] = sub_process
+    active_keywords = {k: v for k, v in sub_keywords.items() if v[0] >= 0}
+    match_keyword = _keyword_matcher(tuple(active_keywords))
+    keyword_targets = tuple(active_keywords.values())
+
+    fd = sub_process.stdout.fileno()
+    if hasattr(fcntl, 'F_SETPIPE_SZ'):
+        # Linux: a 1 MiB pipe lets a chatty child run ahead while a burst is parsed.
+        try:
+            fcntl.fcntl(fd, fcntl.F_SETPIPE_SZ, _PIPE_SIZE)
+        except OSError:
+            pass  # above /proc/sys/fs/pipe-max-size for unprivileged users; keep the default
+    pending = b''
+    sink = io.StringIO()
+    health_report = None
+    while True:
+        chunk = os.read(fd, _READ_SIZE)
+        if chunk:
+            pending += chunk
+            cut = pending.rfind(b'\n') + 1
+            if not cut:
+                continue
+            data, pending = pending[:cut], pending[cut:]
+        else:
+            data, pending = pending, b''
+            if not data:
+                break
+        text, lines = _split_output(data)
+        sink.write(text)
+        timestamp = _ts()
+
+        for line in lines:
+            _log(job, f'[{timestamp}] {line}')
+
+            if 'health_report_' in line:
+                m_report = _HEALTH_REPORT_RE.search(line)
+                if m_report:
+                    health_report = m_report.group(0)
+
+            m_queued = _TEST_QUEUED_RE.search(line)
+            if m_queued:
+                tname = m_queued.group(1)
+                if tname not in job['test_progress']:
+                    job['test_progress'][tname] = _test_entry('queued')
+
+            m_start = _TEST_START_RE.search(line)
+            if m_start:
+                tname = m_start.group(1)
+                job['test_progress'][tname] = _test_entry('running', time.time())
+
+            m_done = _TEST_COMPLETE_RE.search(line)
+            if m_done:
+                tname = m_done.group(1)
+                ec = int(m_done.group(2))
+                dur_str = m_done.group(3).strip()
+                tp = job['test_progress'].get(tname, {})
+                tp['status'] = 'passed' if ec == 0 else 'failed'
+                tp['exit_code'] = ec
+                tp['duration'] = dur_str
+                job['test_progress'][tname] = tp
+
+            rank = match_keyword(line)
+            if rank is None:
+                continue
+            phase_idx, phase_msg, progress = keyword_targets[rank]
+            if phase_idx > current_phase_idx:
+                set_phase(job, current_phase_idx, 'done')
+                for skip_idx in range(current_phase_idx + 1, phase_idx):
+                    if job['phases'][skip_idx]['status'] == 'pending':
+                        job['phases'][skip_idx]['status'] = 'skipped'
+                current_phase_idx = phase_idx
+                phase_idx_box[0] = current_phase_idx
+                set_phase(job, phase_idx, 'running', phase_msg)
+            job['progress'] = progress
+            job['current_phase'] = phase_msg
+    sub_process.stdout.close()
+    rc = sub_process.wait()
+    phase_idx_box[0] = current_phase_idx
+    return rc, sink.getvalue(), health_report
@@ -1,9 +1,11 @@
 """Custom health checks CRUD API routes."""
+import io
 import json as json_lib
 from datetime import datetime
 
-from flask import Response, jsonify, request
+from flask import Response, jsonify, request, stream_with_context
 from flask_login import current_user, login_required
+from sqlalchemy import insert
 
 from app.decorators import log_audit, operator_required
 
@@ -11,6 +13,30 @@ from app.models import CustomCheck, db
 
 from app.routes import dashboard_bp
 
+try:
+    import orjson
+except ImportError:  # optional native codec; stdlib json is used instead
+    orjson = None
+
+if orjson is not None:
+    _json_dumps, _json_loads = orjson.dumps, orjson.loads
+else:
+    _json_dumps, _json_loads = json_lib.dumps, json_lib.loads
+
+
+def _read_upload_text(upload):
+    """Decode an uploaded file as UTF-8 straight off its stream (bad bytes replaced).
+
+    ``newline=''`` keeps CRLF / lone CR exactly as uploaded, like ``read().decode()``.
+    """
+    reader = io.TextIOWrapper(upload.stream, encoding='utf-8', errors='replace', newline='')
+    try:
+        return reader.read()
+    finally:
+        # Hand the stream back to werkzeug instead of closing it with the wrapper.
+        reader.detach()
+
+
 @dashboard_bp.route('/api/custom-checks', methods=['GET'])
 @login_required
 def api_get_custom_checks():
@@ -43,7 +69,7 @@ def api_create_custom_check():
     script_filename = ''
 
     if script_file and script_file.filename:
-        script_content = script_file.read().decode('utf-8', errors='replace')
+        script_content = _read_upload_text(script_file)
         script_filename = script_file.filename
         check_type = 'script'
 
@@ -80,7 +106,7 @@ def api_create_custom_check():
 def api_update_custom_check(check_id):
     """Update an existing custom check."""
     from app.models import CustomCheck
-    check = CustomCheck.query.get(check_id)
+    check = db.session.get(CustomCheck, check_id)
     if not check:
         return jsonify({'success': False, 'error': 'Check not found.'}), 404
     if check.created_by != current_user.id and not current_user.is_admin:
@@ -103,7 +129,7 @@ def api_update_custom_check(check_id):
     if 'script_content' in data:
         check.script_content = data['script_content'].strip() or None
     if script_file and script_file.filename:
-        check.script_content = script_file.read().decode('utf-8', errors='replace')
+        check.script_content = _read_upload_text(script_file)
         check.script_filename = script_file.filename
         check.check_type = 'script'
     if 'script_filename' in data:
@@ -132,7 +158,7 @@ def api_update_custom_check(check_id):
 def api_delete_custom_check(check_id):
     """Delete a custom check."""
     from app.models import CustomCheck
-    check = CustomCheck.query.get(check_id)
+    check = db.session.get(CustomCheck, check_id)
     if not check:
         return jsonify({'success': False, 'error': 'Check not found.'}), 404
     if check.created_by != current_user.id and not current_user.is_admin:
@@ -150,35 +176,43 @@ def api_delete_custom_check(check_id):
 def api_export_custom_checks():
     """Export all custom checks for this user as a JSON file."""
     from app.models import CustomCheck
-    checks = CustomCheck.query.filter_by(created_by=current_user.id).order_by(CustomCheck.name).all()
-    export_data = {
+    query = CustomCheck.query.filter_by(created_by=current_user.id).order_by(CustomCheck.name)
+    count = query.count()
+    exported_at = datetime.now().isoformat(sep=' ', timespec='seconds')  # YYYY-MM-DD HH:MM:SS
+    header = _json_dumps({
         'version': 1,
         'exported_by': current_user.username,
-        'exported_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
-        'checks': [],
-    }
-    for cc in checks:
-        export_data['checks'].append({
-            'name': cc.name,
-            'check_type': cc.check_type or 'command',
-            'command': cc.command or '',
-            'script_content': cc.script_content or '',
-            'script_filename': cc.script_filename or '',
-            'expected_value': cc.expected_value or '',
-            'match_type': cc.match_type or 'contains',
-            'description': cc.description or '',
-            'run_with': cc.run_with or 'health_check',
-            'linked_scenario': cc.linked_scenario or '',
-            'enabled': cc.enabled,
-        })
+        'exported_at': exported_at,
+    })
 
-    from flask import Response
-    import json as _json
-    payload = _json.dumps(export_data, indent=2)
-    filename = f'custom_checks_{current_user.username}_{datetime.now().strftime("%Y%m%d_%H%M%S")}.json'
-    log_audit('custom_check_export', details=f'{len(checks)} checks exported')
+    def generate():
+        # Emit the document piecewise so no full list or string is ever built.
+        yield header[:-1]
+        yield ', "checks": [\n'
+        sep = '  '
+        for cc in query.yield_per(500):
+            yield sep
+            yield _json_dumps({
+                'name': cc.name,
+                'check_type': cc.check_type or 'command',
+                'command': cc.command or '',
+                'script_content': cc.script_content or '',
+                'script_filename': cc.script_filename or '',
+                'expected_value': cc.expected_value or '',
+                'match_type': cc.match_type or 'contains',
+                'description': cc.description or '',
+                'run_with': cc.run_with or 'health_check',
+                'linked_scenario': cc.linked_scenario or '',
+                'enabled': cc.enabled,
+            })
+            sep = ',\n  '
+        yield '\n]}\n'
+
+    stamp = exported_at.replace('-', '').replace(':', '').replace(' ', '_')  # YYYYMMDD_HHMMSS
+    filename = f'custom_checks_{current_user.username}_{stamp}.json'
+    log_audit('custom_check_export', details=f'{count} checks exported')
     return Response(
-        payload,
+        stream_with_context(generate()),
         mimetype='application/json',
         headers={'Content-Disposition': f'attachment; filename="{filename}"'}
     )
@@ -189,15 +223,14 @@ def api_export_custom_checks():
 def api_import_custom_checks():
     """Import custom checks from a JSON file."""
     from app.models import CustomCheck
-    import json as _json
 
     file = request.files.get('file')
     if not file or not file.filename:
         return jsonify({'success': False, 'error': 'No file uploaded.'}), 400
 
     try:
-        raw = file.read().decode('utf-8', errors='replace')
-        data = _json.loads(raw)
+        raw = _read_upload_text(file)
+        data = _json_loads(raw)
     except Exception as e:
         return jsonify({'success': False, 'error': f'Invalid JSON file: {e}'}), 400
 
@@ -209,10 +242,16 @@ def api_import_custom_checks():
 
     if mode == 'replace':
         # Delete existing checks for this user before importing
-        CustomCheck.query.filter_by(created_by=current_user.id).delete()
-        db.session.flush()
+        # One bulk DELETE; nothing below reads CustomCheck instances, so skip session sync.
+        CustomCheck.query.filter_by(created_by=current_user.id).delete(synchronize_session=False)
+
+    existing_names = set()
+    if mode == 'merge':
+        existing_names = {
+            name for (name,) in db.session.query(CustomCheck.name).filter_by(created_by=current_user.id)
+        }
 
-    imported = 0
+    rows = []
     skipped = 0
     for item in checks_data:
         name = item.get('name', '').strip()
@@ -220,12 +259,10 @@ def api_import_custom_checks():
             skipped += 1
             continue
 
-        # In merge mode, skip if same name already exists
-        if mode == 'merge':
-            existing = CustomCheck.query.filter_by(created_by=current_user.id, name=name).first()
-            if existing:
-                skipped += 1
-                continue
+        # In merge mode, skip if same name already exists (or appeared earlier in this file)
+        if mode == 'merge' and name in existing_names:
+            skipped += 1
+            continue
 
         check_type = item.get('check_type', 'command')
         command = item.get('command', '').strip()
@@ -238,23 +275,27 @@ def api_import_custom_checks():
             skipped += 1
             continue
 
-        cc = CustomCheck(
-            name=name,
-            check_type=check_type,
-            command=command,
-            script_content=script_content or None,
-            script_filename=item.get('script_filename', ''),
-            expected_value=item.get('expected_value', ''),
-            match_type=item.get('match_type', 'contains'),
-            description=item.get('description', ''),
-            run_with=item.get('run_with', 'health_check'),
-            linked_scenario=item.get('linked_scenario', '').strip() or None,
-            enabled=item.get('enabled', True),
-            created_by=current_user.id,
-        )
-        db.session.add(cc)
-        imported += 1
+        rows.append({
+            'name': name,
+            'check_type': check_type,
+            'command': command,
+            'script_content': script_content or None,
+            'script_filename': item.get('script_filename', ''),
+            'expected_value': item.get('expected_value', ''),
+            'match_type': item.get('match_type', 'contains'),
+            'description': item.get('description', ''),
+            'run_with': item.get('run_with', 'health_check'),
+            'linked_scenario': item.get('linked_scenario', '').strip() or None,
+            'enabled': item.get('enabled', True),
+            'created_by': current_user.id,
+        })
+        if mode == 'merge':
+            existing_names.add(name)
 
+    # One executemany INSERT (batched by SQLAlchemy) instead of an ORM object per check.
+    if rows:
+        db.session.execute(insert(CustomCheck), rows)
+    imported = len(rows)
     db.session.commit()
     log_audit('custom_check_import', details=f'{imported} imported, {skipped} skipped (mode={mode})')
     return jsonify({
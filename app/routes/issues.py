@@ -0,0 +1,48 @@
+"""Issue extraction from health check console output (feeds the learning store)."""
+import re
+
+# (issue type, pattern, fixed fields).  Every pattern exposes ``name`` and
+# ``status`` groups (plus ``namespace`` for pods) so one loop builds all issues.
+# The migration/storage gaps are capped at 200 chars so a long line full of
+# 'pvc'/'migration' mentions without a status word cannot go quadratic, and
+# runs that are followed by a disjoint class are possessive (no backtracking).
+_ISSUE_PATTERNS = (
+    ('pod', re.compile(r'[❌⚠️]\s*+(?P<namespace>\S+)/(?P<name>\S++)\s++(?P<status>\S++[^\n]*+)(?:\n|$)'), {}),
+    ('operator', re.compile(r'[❌⚠️]\s*+(?P<name>[\w-]++)\s++(?P<status>Degraded|Unavailable|Not Available)',
+                            re.IGNORECASE), {}),
+    ('migration', re.compile(r'migration.{0,200}?(?P<status>failed|stuck|error)', re.IGNORECASE),
+     {'name': 'vm-migration'}),
+    ('storage', re.compile(r'(?P<name>pvc|volume|storage|odf).{0,200}?(?P<status>pending|failed|error|not ready)',
+                           re.IGNORECASE), {}),
+    ('node', re.compile(r'node[s]?\s++(?P<name>\S++)\s++(?P<status>NotReady|SchedulingDisabled)', re.IGNORECASE), {}),
+)
+# 'OOMKilled' contains 'oom', so one case-insensitive scan covers both spellings.
+_OOM_RE = re.compile(r'oom', re.IGNORECASE)
+# Every pattern above needs one of these literals, so output without any of
+# them cannot yield an issue.  Not all such lines carry a WARNING/ERROR marker
+# (e.g. 'node worker-3 NotReady', OOM, PVC Pending), so this is the gate.
+_ISSUE_PREFILTER = re.compile(r'[❌⚠️]|migration|pvc|volume|storage|odf|node|oom', re.IGNORECASE)
+
+
+def has_issue_candidates(output):
+    """Cheap single-scan check: False only when extract_issues_from_output(output) must be empty."""
+    return _ISSUE_PREFILTER.search(output) is not None
+
+
+def extract_issues_from_output(output):
+    """Extract detected issues from health check output for learning.
+
+    Issues are de-duplicated on insert by (type, name, namespace); the first
+    occurrence wins and insertion order is preserved.
+    """
+    unique = {}
+    for issue_type, pattern, fixed in _ISSUE_PATTERNS:
+        for match in pattern.finditer(output):
+            fields = match.groupdict()
+            key = (issue_type, fixed.get('name') or fields['name'], fields.get('namespace') or '')
+            if key not in unique:
+                unique[key] = {'type': issue_type, **fixed, **fields, 'status': fields['status'].strip()}
+    if _OOM_RE.search(output):
+        unique.setdefault(('resource', 'oom-event', ''),
+                          {'type': 'resource', 'name': 'oom-event', 'status': 'OOMKilled'})
+    return list(unique.values())
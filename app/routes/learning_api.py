@@ -1,12 +1,11 @@
 """Jira suggestions and learning API routes."""
 import sys
+import time
 from datetime import datetime
 
 from flask import jsonify, request
 from flask_login import current_user, login_required
 
-from config.settings import AVAILABLE_CHECKS
-
 from app.decorators import operator_required
 
 import app.routes as routes_pkg
@@ -14,9 +13,32 @@ import app.routes as routes_pkg
 from app.routes import (
     dashboard_bp,
     load_suggested_checks,
+    record_suggested_check,
+    register_check,
     save_suggested_checks,
 )
 
+# Jira search results are reused for this long; accept/reject state is
+# still applied fresh on every request.
+_JIRA_BUGS_TTL = 300
+_jira_bugs_cache = (0.0, None)  # (monotonic expiry, bugs from the last successful search)
+
+
+def _recent_jira_bugs(search):
+    """Return ``search(days=30, limit=50)``, reusing a successful result for _JIRA_BUGS_TTL seconds."""
+    global _jira_bugs_cache
+    expires, bugs = _jira_bugs_cache
+    if bugs and time.monotonic() < expires:
+        return bugs
+    try:
+        bugs = search(days=30, limit=50)
+    except Exception:
+        return None
+    if bugs:
+        _jira_bugs_cache = (time.monotonic() + _JIRA_BUGS_TTL, bugs)
+    return bugs
+
+
 @dashboard_bp.route('/api/jira/suggestions')
 @login_required
 def api_jira_suggestions():
@@ -34,10 +56,7 @@ def api_jira_suggestions():
         accepted_checks = {s['name'] for s in routes_pkg.suggested_checks if s.get('status') == 'accepted'}
         existing_checks.extend(list(accepted_checks))
 
-        try:
-            bugs = search_jira_for_new_bugs(days=30, limit=50)
-        except Exception:
-            bugs = None
+        bugs = _recent_jira_bugs(search_jira_for_new_bugs)
         if not bugs:
             bugs = get_known_recent_bugs()
 
@@ -82,18 +101,14 @@ def api_jira_accept_check():
             'category': category, 'status': 'accepted',
             'accepted_at': datetime.now().strftime('%Y-%m-%d %H:%M')
         }
-        existing = next((s for s in routes_pkg.suggested_checks if s['name'] == check_name), None)
-        if existing:
-            existing.update(check_record)
-        else:
-            routes_pkg.suggested_checks.append(check_record)
+        record_suggested_check(check_record)
         save_suggested_checks()
 
-        AVAILABLE_CHECKS[check_name] = {
+        register_check(check_name, {
             'name': check_name.replace('_', ' ').title(),
             'description': description, 'category': category,
             'default': True, 'jira': jira_key, 'custom': True
-        }
+        })
 
         # Also write into the dynamic knowledge base so the RCA pattern
         # engine matches this issue on subsequent runs.
@@ -135,11 +150,7 @@ def api_jira_reject_check():
             return jsonify({'success': False, 'error': 'Check name is required'})
 
         check_record = {'name': check_name, 'status': 'rejected', 'rejected_at': datetime.now().strftime('%Y-%m-%d %H:%M')}
-        existing = next((s for s in routes_pkg.suggested_checks if s['name'] == check_name), None)
-        if existing:
-            existing.update(check_record)
-        else:
-            routes_pkg.suggested_checks.append(check_record)
+        record_suggested_check(check_record)
         save_suggested_checks()
         return jsonify({'success': True, 'message': f'Check "{check_name}" rejected'})
     except Exception as e:
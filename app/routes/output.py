@@ -0,0 +1,83 @@
+"""Console output buffering for running jobs.
+
+A running job keeps only a rolling tail of its console in memory (served to
+live pollers); the full log is spooled to an anonymous temp file and read
+back once when the build record is saved.  The job's ``output_lock`` guards
+the spool file, which the build thread writes while api_stop may read it.
+"""
+import os
+import tempfile
+from collections import deque
+from contextlib import nullcontext
+from itertools import count
+
+from config.settings import Config
+
+_OUTPUT_TAIL_CHUNKS = Config.MAX_OUTPUT_LINES
+_OUTPUT_LOG_BUFFER = 65536
+_output_seq = count(1)
+
+
+def new_output():
+    """Create a running job's live console tail: the last _OUTPUT_TAIL_CHUNKS chunks written with _log()."""
+    return deque(maxlen=_OUTPUT_TAIL_CHUNKS)
+
+
+def new_output_log():
+    """Create a running job's full-log spool file (already unlinked; gone once closed or collected)."""
+    return tempfile.TemporaryFile(buffering=_OUTPUT_LOG_BUFFER)
+
+
+def _log(job, text):
+    """Append a chunk of console text to a running job's live tail and full log."""
+    job['output'].append(text)
+    with job['output_lock']:
+        log = job.get('output_log')
+        if log is not None:
+            log.write(text.encode('utf-8'))
+    job['_output_seq'] = next(_output_seq)
+
+
+def get_output(job):
+    """Console text for display: a running job's live tail, or a saved build's full output.
+
+    The joined tail is cached on the job until the next _log(), so repeated
+    /api/status polls between writes do not re-join it.
+    """
+    output = job.get('output', '')
+    if isinstance(output, str):
+        return output
+    seq = job.get('_output_seq')
+    cached = job.get('_output_joined')
+    if cached and cached[0] == seq:
+        return cached[1]
+    text = ''.join(output)
+    job['_output_joined'] = (seq, text)
+    return text
+
+
+def get_full_output(job):
+    """A running job's complete console log, read back from its spool file for the build record.
+
+    Safe to call from a request thread (api_stop) while the build thread is still logging.
+    """
+    with job.get('output_lock') or nullcontext():
+        log = job.get('output_log')
+        if log is not None:
+            log.flush()
+            fd = log.fileno()
+            return os.pread(fd, os.fstat(fd).st_size, 0).decode('utf-8', 'replace')
+    return get_output(job)
+
+
+def close_output_log(job):
+    """Close and detach a job's spool file once its build record is saved.
+
+    Only the thread that owns the build calls this (run_job's finally, or a
+    slot that failed to launch); api_stop just reads the log.  Idempotent;
+    anything logged afterwards only reaches the live tail.
+    """
+    with job['output_lock']:
+        log = job.pop('output_log', None)
+        if log is not None:
+            log.close()
@@ -2,6 +2,7 @@
 
 import json
 import os
+import re
 import uuid
 from datetime import datetime, timezone
 
@@ -12,6 +13,8 @@ from app.decorators import operator_required
 from app.routes import dashboard_bp
 from app.routes.perf_reports import _safe_path, PERF_REPORTS_DIR
 
+_BODY_RE = re.compile(r'(<body[^>]*>)(.*?)(</body>)', re.DOTALL | re.IGNORECASE)
+
 
 def _comments_file(report_abs_path):
     """Return the .comments.json path for a given report file."""
@@ -192,10 +195,7 @@ def perf_reports_save_content(subpath):
     has_full_doc = "<html" in original.lower()[:200]
 
     if has_full_doc:
-        import re
-        body_match = re.search(
-            r'(<body[^>]*>)(.*?)(</body>)', original, re.DOTALL | re.IGNORECASE
-        )
+        body_match = _BODY_RE.search(original)
         if body_match:
             new_html = (
                 original[:body_match.start(2)] + content + original[body_match.end(2):]
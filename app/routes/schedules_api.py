@@ -4,17 +4,17 @@ from datetime import datetime
 from flask import jsonify, request
 from flask_login import current_user, login_required
 
-from config.settings import AVAILABLE_CHECKS
-
 from app.decorators import operator_required
 
 from app.routes import (
+    add_schedule,
+    all_check_keys,
     dashboard_bp,
+    enriched_schedules,
+    find_schedule,
     load_schedules,
+    remove_schedule,
     save_schedules,
-    get_next_run_time,
-    get_cron_display,
-    schedules,
 )
 from app.routes.build_executor import start_build
 
@@ -22,11 +22,7 @@ from app.routes.build_executor import start_build
 @login_required
 def api_get_schedules():
     """API endpoint to get all schedules"""
-    load_schedules()
-    for schedule in schedules:
-        schedule['next_run'] = get_next_run_time(schedule)
-        schedule['cron_display'] = get_cron_display(schedule)
-    return jsonify({'success': True, 'schedules': schedules})
+    return jsonify({'success': True, 'schedules': enriched_schedules()})
 
 
 @dashboard_bp.route('/api/schedule', methods=['POST'])
@@ -36,14 +32,17 @@ def api_create_schedule():
     import uuid
     try:
         data = request.get_json() or {}
+        checks = data.get('checks')
+        if checks is None:
+            checks = all_check_keys()
         schedule = {
             'id': str(uuid.uuid4())[:8],
             'name': data.get('name', 'Unnamed Schedule'),
             'type': data.get('type', 'recurring'),
             'frequency': data.get('frequency', 'daily'),
             'time': data.get('time', '06:00'),
-            'checks': data.get('checks', list(AVAILABLE_CHECKS.keys())),
-            'checks_count': len(data.get('checks', AVAILABLE_CHECKS)),
+            'checks': checks,
+            'checks_count': len(checks),
             'options': data.get('options', {'rca_level': 'none'}),
             'status': 'active',
             'created': datetime.now().strftime('%Y-%m-%d %H:%M'),
@@ -59,7 +58,7 @@ def api_create_schedule():
         elif schedule['frequency'] == 'custom':
             schedule['cron'] = data.get('cron', '0 6 * * *')
 
-        schedules.append(schedule)
+        add_schedule(schedule)
         save_schedules()
         return jsonify({'success': True, 'schedule': schedule})
     except Exception as e:
@@ -72,7 +71,7 @@ def api_schedule_action(schedule_id, action):
     """API endpoint to pause/resume a schedule"""
     load_schedules()
     try:
-        schedule = next((s for s in schedules if s.get('id') == schedule_id), None)
+        schedule = find_schedule(schedule_id)
         if not schedule:
             return jsonify({'success': False, 'error': 'Schedule not found'})
         if action == 'pause':
@@ -93,11 +92,13 @@ def api_schedule_run(schedule_id):
     """API endpoint to run a schedule immediately"""
     load_schedules()
     try:
-        schedule = next((s for s in schedules if s.get('id') == schedule_id), None)
+        schedule = find_schedule(schedule_id)
         if not schedule:
             return jsonify({'success': False, 'error': 'Schedule not found'})
 
-        checks = schedule.get('checks', list(AVAILABLE_CHECKS.keys()))
+        checks = schedule.get('checks')
+        if checks is None:
+            checks = all_check_keys()
         options = schedule.get('options', {'rca_level': 'none'})
         options['scheduled'] = True
         options['schedule_id'] = schedule_id
@@ -120,10 +121,10 @@ def api_schedule_delete(schedule_id):
     """API endpoint to delete a schedule"""
     load_schedules()
     try:
-        schedule = next((s for s in schedules if s.get('id') == schedule_id), None)
-        if not schedule:
+        schedule = find_schedule(schedule_id)
+        if schedule is None:
             return jsonify({'success': False, 'error': 'Schedule not found'})
-        schedules[:] = [s for s in schedules if s.get('id') != schedule_id]
+        remove_schedule(schedule)
         save_schedules()
         return jsonify({'success': True})
     except Exception as e:
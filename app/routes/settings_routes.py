@@ -1,8 +1,12 @@
 """Settings page and host / SSH API routes."""
+import functools
 import os
+import re
+import shutil
 from datetime import datetime
 
-from flask import jsonify, render_template, request
+import paramiko
+from flask import Response, jsonify, render_template, request
 from flask_login import current_user, login_required
 
 from config.settings import CNV_GLOBAL_VARIABLES, CNV_SCENARIOS, Config
@@ -19,10 +23,13 @@ from app.routes import (
     _DEFAULT_CNV_SETTINGS,
     BASE_DIR,
     _collect_scenario_var_defaults,
+    _not_modified,
     get_hosts_for_user,
     get_thresholds,
+    invalidate_host_cache,
     load_settings,
     save_settings,
+    settings_snapshot,
 )
 
 def _send_cnv_email_report(recipient, build_num, build_name, status, status_text,
@@ -95,25 +102,23 @@ Passed: {passed} | Failed: {failed} | Total: {len(tests)}
 
 def _setup_passwordless_ssh(host, user, password):
     """Setup passwordless SSH to a host. Returns (success, message)."""
-    import paramiko
     home = os.path.expanduser("~")
     ssh_dir = os.path.join(home, ".ssh")
     key_path = os.path.join(ssh_dir, "id_ed25519")
     pub_path = key_path + ".pub"
 
     try:
-        os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
         if not os.path.exists(key_path):
+            os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
             key = paramiko.Ed25519Key.generate()
+            # paramiko creates the private key file as 0600 itself
             key.write_private_key_file(key_path)
-            os.chmod(key_path, 0o600)
             pub_key_str = f"{key.get_name()} {key.get_base64()} cnv-healthcrew"
             with open(pub_path, 'w') as f:
                 f.write(pub_key_str + "\n")
             os.chmod(pub_path, 0o644)
         else:
-            key = paramiko.Ed25519Key(filename=key_path)
-            pub_key_str = f"{key.get_name()} {key.get_base64()} cnv-healthcrew"
+            pub_key_str = _cached_pubkey(key_path, os.path.getmtime(key_path))
 
         client = paramiko.SSHClient()
         client.load_system_host_keys()
@@ -122,19 +127,16 @@ def _setup_passwordless_ssh(host, user, password):
 
         from app.ssh_utils import build_pubkey_install_cmd
         commands = build_pubkey_install_cmd(pub_key_str)
-        stdin, stdout, stderr = client.exec_command(commands)
-        exit_status = stdout.channel.recv_exit_status()
-        err_output = stderr.read().decode().strip()
-        client.close()
+        # Install exits 0 only once the key is in authorized_keys (see api_ssh_setup).
+        try:
+            stdin, stdout, stderr = client.exec_command(commands)
+            exit_status = stdout.channel.recv_exit_status()
+            err_output = stderr.read().decode().strip()
+        finally:
+            client.close()
 
         if exit_status != 0:
             return False, f'Failed to install key: {err_output}'
-
-        verify_client = paramiko.SSHClient()
-        verify_client.load_system_host_keys()
-        verify_client.set_missing_host_key_policy(paramiko.WarningPolicy())
-        verify_client.connect(host, username=user, key_filename=key_path, timeout=15)
-        verify_client.close()
         return True, 'OK'
     except Exception as e:
         return False, str(e)
@@ -185,7 +187,7 @@ def sync_hosts_from_form(host_ids, host_names, host_addrs, host_users, host_pass
         hid = hid.strip()
         if hid:
             # Update existing host
-            host_obj = Host.query.get(int(hid))
+            host_obj = db.session.get(Host, int(hid))
             if host_obj and (host_obj.created_by == user.id or user.is_admin):
                 host_obj.name = name
                 host_obj.host = addr
@@ -203,8 +205,24 @@ def sync_hosts_from_form(host_ids, host_names, host_addrs, host_users, host_pass
             db.session.add(host_obj)
 
     db.session.commit()
+    invalidate_host_cache()
     return first_host, first_user, ssh_messages
 
+
+# Parallel per-host arrays posted by the settings form, in sync_hosts_from_form order
+_HOST_FORM_FIELDS = ('host_id[]', 'host_name[]', 'host_addr[]', 'host_user[]', 'host_password[]')
+# (settings key, form field, default) for the free-text CNV settings
+_CNV_STRING_FIELDS = (
+    ('cnv_path', 'cnv_path', '/home/kni/git/cnv-scenarios'),
+    ('mode', 'cnv_mode', 'sanity'),
+    ('kb_log_level', 'cnv_kb_log_level', ''),
+    ('kb_timeout', 'cnv_kb_timeout', ''),
+    ('grafana_url', 'cnv_grafana_url', ''),
+)
+# Global CNV variables, posted as cnv_default_<name>
+_CNV_GLOBAL_KEYS = ('storageClassName', 'nodeSelector', 'maxWaitTimeout', 'jobPause', 'esServer')
+
+
 @dashboard_bp.route('/settings', methods=['GET', 'POST'])
 @login_required
 def settings_page():
@@ -216,12 +234,15 @@ def settings_page():
         if not current_user.is_operator:
             return "Access denied. Operator role required.", 403
 
-        # Sync hosts to DB (per-user)
-        host_ids = request.form.getlist('host_id[]')
-        host_names = request.form.getlist('host_name[]')
-        host_addrs = request.form.getlist('host_addr[]')
-        host_users = request.form.getlist('host_user[]')
-        host_passwords = request.form.getlist('host_password[]')
+        f = request.form
+
+        # Sync hosts to DB (per-user); bin the parallel host arrays in one walk of the form
+        host_fields = {name: [] for name in _HOST_FORM_FIELDS}
+        for name, value in f.items(multi=True):
+            bucket = host_fields.get(name)
+            if bucket is not None:
+                bucket.append(value)
+        host_ids, host_names, host_addrs, host_users, host_passwords = host_fields.values()
         # Pad passwords list to match hosts (existing hosts don't have password fields)
         while len(host_passwords) < len(host_ids):
             host_passwords.append('')
@@ -230,51 +251,32 @@ def settings_page():
         )
 
         new_settings = {
-            'thresholds': {
-                'cpu_warning': int(request.form.get('cpu_warning', 85)),
-                'memory_warning': int(request.form.get('memory_warning', 80)),
-                'disk_latency': int(request.form.get('disk_latency', 100)),
-                'etcd_latency': int(request.form.get('etcd_latency', 100)),
-                'pod_density': int(request.form.get('pod_density', 50)),
-                'restart_count': int(request.form.get('restart_count', 5)),
-                'virt_handler_memory': int(request.form.get('virt_handler_memory', 500))
-            },
+            'thresholds': {k: int(f.get(k, default)) for k, default in DEFAULT_THRESHOLDS.items()},
             'ssh': {
                 'host': first_host,
                 'user': first_user,
             },
             'ai': {
-                'model': request.form.get('ollama_model', 'ollama/llama3.2:3b').strip(),
-                'url': request.form.get('ollama_url', 'http://localhost:11434').strip()
+                'model': f.get('ollama_model', 'ollama/llama3.2:3b').strip(),
+                'url': f.get('ollama_url', 'http://localhost:11434').strip()
             },
             'jira': {
-                'projects': [p.strip() for p in request.form.get('jira_projects', 'CNV, OCPBUGS, ODF').split(',')],
-                'scan_days': int(request.form.get('jira_scan_days', 30)),
-                'bug_limit': int(request.form.get('jira_bug_limit', 50))
+                'projects': [p.strip() for p in f.get('jira_projects', 'CNV, OCPBUGS, ODF').split(',')],
+                'scan_days': int(f.get('jira_scan_days', 30)),
+                'bug_limit': int(f.get('jira_bug_limit', 50))
             },
             'cnv': {
-                'cnv_path': request.form.get('cnv_path', '/home/kni/git/cnv-scenarios').strip(),
-                'mode': request.form.get('cnv_mode', 'sanity').strip(),
-                'parallel': 'cnv_parallel' in request.form,
-                'kb_log_level': request.form.get('cnv_kb_log_level', '').strip(),
-                'kb_timeout': request.form.get('cnv_kb_timeout', '').strip(),
-                'grafana_url': request.form.get('cnv_grafana_url', '').strip(),
-                'global_vars': {
-                    'storageClassName': request.form.get('cnv_default_storageClassName', '').strip(),
-                    'nodeSelector': request.form.get('cnv_default_nodeSelector', '').strip(),
-                    'maxWaitTimeout': request.form.get('cnv_default_maxWaitTimeout', '').strip(),
-                    'jobPause': request.form.get('cnv_default_jobPause', '').strip(),
-                    'esServer': request.form.get('cnv_default_esServer', '').strip(),
-                },
-                'scenario_vars': _collect_scenario_var_defaults(request.form),
+                **{key: f.get(field, default).strip() for key, field, default in _CNV_STRING_FIELDS},
+                'parallel': 'cnv_parallel' in f,
+                'global_vars': {k: f.get(f'cnv_default_{k}', '').strip() for k in _CNV_GLOBAL_KEYS},
+                'scenario_vars': _collect_scenario_var_defaults(f),
             }
         }
 
         save_settings(new_settings)
 
         if first_host:
-            _update_env_var('RH_LAB_HOST', first_host)
-            _update_env_var('RH_LAB_USER', first_user)
+            _update_env_vars({'RH_LAB_HOST': first_host, 'RH_LAB_USER': first_user})
 
         log_audit('settings_update', details='Settings updated')
         message = "Your settings have been saved successfully."
@@ -312,13 +314,24 @@ def settings_page():
 @dashboard_bp.route('/api/settings', methods=['GET'])
 @login_required
 def api_get_settings():
-    return jsonify(load_settings())
+    text, etag = settings_snapshot()
+    if etag in request.if_none_match:
+        return _not_modified(etag)
+    response = Response(text, mimetype='application/json')
+    response.set_etag(etag)
+    return response
 
 
 @dashboard_bp.route('/api/settings/thresholds', methods=['GET'])
 @login_required
 def api_get_thresholds():
-    return jsonify(get_thresholds())
+    # Thresholds are a slice of the settings, so the settings ETag covers them too
+    etag = settings_snapshot()[1]
+    if etag in request.if_none_match:
+        return _not_modified(etag)
+    response = jsonify(get_thresholds())
+    response.set_etag(etag)
+    return response
 
 
 # =============================================================================
@@ -341,6 +354,7 @@ def api_add_host():
     host_obj = Host(name=label, host=addr, user=user, created_by=current_user.id)
     db.session.add(host_obj)
     db.session.commit()
+    invalidate_host_cache()
     log_audit('host_add', target=f'{user}@{addr}', details=f'Added host {label}')
     return jsonify({'success': True, 'host': host_obj.to_dict()})
 
@@ -349,7 +363,7 @@ def api_add_host():
 @operator_required
 def api_delete_host(host_id):
     """Delete a jump host from the DB."""
-    host_obj = Host.query.get(host_id)
+    host_obj = db.session.get(Host, host_id)
     if not host_obj:
         return jsonify({'success': False, 'error': 'Host not found.'}), 404
     # Only owner or admin can delete
@@ -358,6 +372,7 @@ def api_delete_host(host_id):
     log_audit('host_delete', target=f'{host_obj.user}@{host_obj.host}', details=f'Deleted host {host_obj.name}')
     db.session.delete(host_obj)
     db.session.commit()
+    invalidate_host_cache()
     return jsonify({'success': True})
 
 
@@ -365,10 +380,16 @@ def api_delete_host(host_id):
 # SSH Setup Routes
 # =============================================================================
 
+@functools.lru_cache(maxsize=8)
+def _cached_pubkey(key_path, mtime):
+    """Public key line for an existing Ed25519 key; ``mtime`` keys out stale entries."""
+    key = paramiko.Ed25519Key(filename=key_path)
+    return f"{key.get_name()} {key.get_base64()} cnv-healthcrew"
+
+
 @dashboard_bp.route('/api/ssh/setup', methods=['POST'])
 @operator_required
 def api_ssh_setup():
-    import paramiko
     data = request.get_json(force=True)
     host = data.get('host', '').strip()
     user = data.get('user', '').strip()
@@ -383,18 +404,17 @@ def api_ssh_setup():
     pub_path = key_path + ".pub"
 
     try:
-        os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
         if not os.path.exists(key_path):
+            os.makedirs(ssh_dir, mode=0o700, exist_ok=True)
             key = paramiko.Ed25519Key.generate()
+            # paramiko creates the private key file as 0600 itself
             key.write_private_key_file(key_path)
-            os.chmod(key_path, 0o600)
             pub_key_str = f"{key.get_name()} {key.get_base64()} cnv-healthcrew"
             with open(pub_path, 'w') as f:
                 f.write(pub_key_str + "\n")
             os.chmod(pub_path, 0o644)
         else:
-            key = paramiko.Ed25519Key(filename=key_path)
-            pub_key_str = f"{key.get_name()} {key.get_base64()} cnv-healthcrew"
+            pub_key_str = _cached_pubkey(key_path, os.path.getmtime(key_path))
 
         client = paramiko.SSHClient()
         client.load_system_host_keys()
@@ -403,29 +423,26 @@ def api_ssh_setup():
 
         from app.ssh_utils import build_pubkey_install_cmd
         commands = build_pubkey_install_cmd(pub_key_str)
-        stdin, stdout, stderr = client.exec_command(commands)
-        exit_status = stdout.channel.recv_exit_status()
-        err_output = stderr.read().decode().strip()
-        client.close()
+        # The install command only succeeds once the key line is present in
+        # authorized_keys, so its exit status is the verification; no second
+        # connection (and handshake) is opened just to log in with the key.
+        try:
+            stdin, stdout, stderr = client.exec_command(commands)
+            exit_status = stdout.channel.recv_exit_status()
+            err_output = stderr.read().decode().strip()
+        finally:
+            client.close()
 
         if exit_status != 0:
             return jsonify({'success': False, 'error': f'Failed to install public key: {err_output}'})
 
-        verify_client = paramiko.SSHClient()
-        verify_client.load_system_host_keys()
-        verify_client.set_missing_host_key_policy(paramiko.WarningPolicy())
-        verify_client.connect(host, username=user, key_filename=key_path, timeout=15)
-        verify_client.close()
-
         settings = load_settings()
         settings.setdefault('ssh', {})
         settings['ssh']['host'] = host
         settings['ssh']['user'] = user
         save_settings(settings)
 
-        _update_env_var('RH_LAB_HOST', host)
-        _update_env_var('RH_LAB_USER', user)
-        _update_env_var('SSH_KEY_PATH', key_path)
+        _update_env_vars({'RH_LAB_HOST': host, 'RH_LAB_USER': user, 'SSH_KEY_PATH': key_path})
 
         # Also save the host to DB if requested (from the combined add-host flow)
         save_host = data.get('save_host', False)
@@ -436,6 +453,7 @@ def api_ssh_setup():
             host_obj = Host(name=label, host=host, user=user, created_by=current_user.id)
             db.session.add(host_obj)
             db.session.commit()
+            invalidate_host_cache()
             host_dict = host_obj.to_dict()
 
         log_audit('ssh_setup', target=f'{user}@{host}', details='SSH key setup completed')
@@ -451,7 +469,8 @@ def api_ssh_setup():
         return jsonify({'success': False, 'error': f'SSH error: {str(e)}'})
     except Exception as e:
         return jsonify({'success': False, 'error': f'Unexpected error: {str(e)}'})
-def _update_env_var(key, value):
+def _update_env_vars(updates):
+    """Set KEY=value lines in the env file: one read, one regex pass per key, one atomic rewrite."""
     from pathlib import Path
     installed_cfg = Path.home() / ".config" / "cnv-healthcrew" / "config.env"
     if installed_cfg.exists():
@@ -459,17 +478,22 @@ def _update_env_var(key, value):
     else:
         env_file = os.path.join(BASE_DIR, ".env")
 
-    lines = []
-    found = False
-    if os.path.exists(env_file):
+    try:
         with open(env_file, 'r') as f:
-            for line in f:
-                if line.strip().startswith(f'{key}='):
-                    lines.append(f'{key}={value}\n')
-                    found = True
-                else:
-                    lines.append(line)
-    if not found:
-        lines.append(f'{key}={value}\n')
-    with open(env_file, 'w') as f:
-        f.writelines(lines)
+            text = f.read()
+    except FileNotFoundError:
+        text = ''
+    for key, value in updates.items():
+        line = f'{key}={value}'
+        text, found = re.subn(rf'^[ \t]*{re.escape(key)}=.*$', lambda _m: line, text, flags=re.MULTILINE)
+        if not found:
+            if text and not text.endswith('\n'):
+                text += '\n'
+            text += line + '\n'
+
+    tmp_file = env_file + '.tmp'
+    with open(tmp_file, 'w') as f:
+        f.write(text)
+    if os.path.exists(env_file):
+        shutil.copymode(env_file, tmp_file)
+    os.replace(tmp_file, env_file)
@@ -0,0 +1,288 @@
+"""JSON-file backed dashboard state: settings, schedules and suggested checks.
+
+Each store keeps a module-level object that is refreshed in place, so
+modules that imported it by name (directly or via ``app.routes``) keep
+seeing the current contents.  Files are only re-parsed when their mtime
+changes.
+"""
+import atexit
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from flask import Response, current_app, jsonify
+
+from config.settings import Config
+
+try:
+    import orjson
+except ImportError:  # optional native codec; stdlib json is used instead
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+log = logging.getLogger(__name__)
+
+
+def fast_jsonify(obj):
+    """jsonify() for large, frequently polled payloads; encodes with orjson when available."""
+    if orjson is None:
+        return jsonify(obj)
+    return current_app.response_class(orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS),
+                                      mimetype='application/json')
+
+
+def _write_json_file(path, obj):
+    """Write ``obj`` to ``path`` as indented UTF-8 JSON, serialized before the file is truncated."""
+    if orjson is not None:
+        data = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    else:
+        data = json.dumps(obj, indent=2).encode('utf-8')
+    with open(path, 'wb') as f:
+        f.write(data)
+
+
+SCHEDULES_FILE = os.path.join(Config.BASE_DIR, "schedules.json")
+SETTINGS_FILE = os.path.join(Config.BASE_DIR, ".settings.json")
+SUGGESTED_CHECKS_FILE = os.path.join(Config.BASE_DIR, ".suggested_checks.json")
+
+
+# ── Settings ─────────────────────────────────────────────────────────────
+
+DEFAULT_THRESHOLDS = {
+    'cpu_warning': 85,
+    'memory_warning': 80,
+    'disk_latency': 100,
+    'etcd_latency': 100,
+    'pod_density': 50,
+    'restart_count': 5,
+    'virt_handler_memory': 500
+}
+
+_DEFAULT_CNV_SETTINGS = {
+    'cnv_path': '/home/kni/git/cnv-scenarios',
+    'mode': 'sanity',
+    'parallel': False,
+    'kb_log_level': '',
+    'kb_timeout': '',
+    'grafana_url': 'http://rhev-gw.rdu2.scalelab.redhat.com:3002/dashboards/f/d86573a6-d3fa-44ee-a217-550851f3e818/cnv',
+    'global_vars': {},
+    'scenario_vars': {},
+}
+
+DEFAULT_SETTINGS = {
+    'thresholds': DEFAULT_THRESHOLDS,
+    'ssh': {'host': '', 'user': 'root'},
+    'ai': {'model': 'ollama/llama3.2:3b', 'url': 'http://localhost:11434'},
+    'jira': {'projects': ['CNV', 'OCPBUGS', 'ODF'], 'scan_days': 30, 'bug_limit': 50},
+    'cnv': _DEFAULT_CNV_SETTINGS,
+}
+
+_settings_cache = (None, None, None)  # (settings file mtime_ns, merged settings as JSON text, ETag)
+
+
+def settings_snapshot():
+    """Return ``(json_text, etag)`` for the merged settings.
+
+    Cached until the settings file's mtime changes; the ETag is a short
+    BLAKE2b digest of the JSON text, so it only moves when the content does.
+    """
+    global _settings_cache
+    try:
+        mtime = os.stat(SETTINGS_FILE).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime is not None and _settings_cache[0] == mtime:
+        return _settings_cache[1], _settings_cache[2]
+    merged = DEFAULT_SETTINGS
+    if mtime is not None:
+        try:
+            with open(SETTINGS_FILE, 'rb') as f:
+                settings = _json_loads(f.read())
+                merged = DEFAULT_SETTINGS.copy()
+                for key in settings:
+                    if isinstance(settings[key], dict):
+                        merged[key] = {**DEFAULT_SETTINGS.get(key, {}), **settings[key]}
+                    else:
+                        merged[key] = settings[key]
+        except (json.JSONDecodeError, OSError, ValueError):
+            mtime, merged = None, DEFAULT_SETTINGS
+    text = json.dumps(merged)
+    etag = hashlib.blake2b(text.encode('utf-8'), digest_size=8).hexdigest()
+    if mtime is not None:
+        _settings_cache = (mtime, text, etag)
+    return text, etag
+
+
+def _not_modified(etag):
+    """Empty 304 for a poll whose If-None-Match already has the current ETag."""
+    response = Response(status=304)
+    response.set_etag(etag)
+    return response
+
+
+def load_settings():
+    """Load user settings from file.
+
+    Every call decodes a fresh copy of the cached settings, so callers may mutate it.
+    """
+    return _json_loads(settings_snapshot()[0])
+
+
+def save_settings(settings):
+    """Save user settings to file"""
+    global _settings_cache
+    _write_json_file(SETTINGS_FILE, settings)
+    _settings_cache = (None, None, None)
+
+
+# ── Schedules ────────────────────────────────────────────────────────────
+
+schedules = []
+_schedules_mtime = None
+_schedules_by_id = None  # id -> schedule; dropped by every function that changes the list
+
+
+def load_schedules():
+    """Load schedules from file.
+
+    The file is only re-parsed when its mtime changes (e.g. the background
+    scheduler wrote it), so handlers can call this on every request.
+    """
+    global _schedules_mtime, _schedules_by_id
+    try:
+        mtime = os.stat(SCHEDULES_FILE).st_mtime_ns
+    except OSError:
+        return schedules
+    if mtime == _schedules_mtime:
+        return schedules
+    _schedules_by_id = None
+    try:
+        with open(SCHEDULES_FILE, 'rb') as f:
+            schedules[:] = _json_loads(f.read())
+        _schedules_mtime = mtime
+    except (json.JSONDecodeError, OSError, ValueError):
+        schedules.clear()
+    return schedules
+
+
+def save_schedules():
+    """Save schedules to file"""
+    global _schedules_mtime
+    _write_json_file(SCHEDULES_FILE, schedules)
+    _schedules_mtime = os.stat(SCHEDULES_FILE).st_mtime_ns
+
+
+def add_schedule(schedule):
+    """Append ``schedule`` to the shared list (callers then save_schedules())."""
+    global _schedules_by_id
+    schedules.append(schedule)
+    _schedules_by_id = None
+
+
+def remove_schedule(schedule):
+    """Remove ``schedule`` from the shared list (callers then save_schedules())."""
+    global _schedules_by_id
+    schedules.remove(schedule)
+    _schedules_by_id = None
+
+
+def find_schedule(schedule_id):
+    """Return the shared schedule dict with ``schedule_id``, or None.
+
+    Served from an id index that is rebuilt on the first lookup after the
+    list is reloaded or a schedule is added or removed.
+    """
+    global _schedules_by_id
+    index = _schedules_by_id
+    if index is None:
+        index = _schedules_by_id = {s.get('id'): s for s in schedules}
+    return index.get(schedule_id)
+
+
+# ── Suggested checks ─────────────────────────────────────────────────────
+
+suggested_checks = []
+_suggested_mtime = None
+_suggested_by_name = None  # name -> record; dropped by every function that changes the list
+
+# Accept/reject clicks come in bursts; saves within this window share one write.
+# The lock also guards the list itself, so the timer thread never serializes
+# it while a request thread is changing it.
+_SUGGESTED_SAVE_DELAY = 0.2
+_suggested_save_lock = threading.Lock()
+_suggested_save_timer = None
+
+
+def find_suggested_check(name):
+    """Return the ``suggested_checks`` record for ``name``, or None (indexed like find_schedule)."""
+    global _suggested_by_name
+    index = _suggested_by_name
+    if index is None:
+        index = _suggested_by_name = {s['name']: s for s in suggested_checks}
+    return index.get(name)
+
+
+def record_suggested_check(record):
+    """Merge ``record`` into the entry with the same name, or append it (callers then save)."""
+    global _suggested_by_name
+    with _suggested_save_lock:
+        existing = find_suggested_check(record['name'])
+        if existing is not None:
+            existing.update(record)
+            return
+        suggested_checks.append(record)
+        _suggested_by_name = None
+
+
+def load_suggested_checks():
+    """Load Jira-suggested check decisions, re-parsing only when the file's mtime changes."""
+    global _suggested_mtime, _suggested_by_name
+    try:
+        mtime = os.stat(SUGGESTED_CHECKS_FILE).st_mtime_ns
+    except OSError:
+        return suggested_checks
+    if mtime == _suggested_mtime:
+        return suggested_checks
+    try:
+        with open(SUGGESTED_CHECKS_FILE, 'rb') as f:
+            loaded = _json_loads(f.read())
+    except Exception:
+        loaded, mtime = [], None
+    with _suggested_save_lock:
+        suggested_checks[:] = loaded
+        _suggested_by_name = None
+        _suggested_mtime = mtime
+    return suggested_checks
+
+
+def save_suggested_checks():
+    """Schedule a write of ``suggested_checks``; the in-memory list stays authoritative meanwhile."""
+    global _suggested_save_timer
+    with _suggested_save_lock:
+        if _suggested_save_timer is None:
+            _suggested_save_timer = threading.Timer(_SUGGESTED_SAVE_DELAY, flush_suggested_checks)
+            _suggested_save_timer.daemon = True
+            _suggested_save_timer.start()
+
+
+def flush_suggested_checks():
+    """Write ``suggested_checks`` now if a save is pending (also runs at interpreter exit)."""
+    global _suggested_save_timer, _suggested_mtime
+    with _suggested_save_lock:
+        timer, _suggested_save_timer = _suggested_save_timer, None
+        if timer is None:
+            return
+        timer.cancel()
+        try:
+            _write_json_file(SUGGESTED_CHECKS_FILE, suggested_checks)
+            _suggested_mtime = os.stat(SUGGESTED_CHECKS_FILE).st_mtime_ns
+        except Exception:
+            # Runs on the timer thread (or at exit), so nobody else would see it;
+            # the in-memory list is unchanged and the next save retries.
+            log.exception("Could not write %s", SUGGESTED_CHECKS_FILE)
+
+
+atexit.register(flush_suggested_checks)
@@ -177,14 +177,14 @@ def _run_single_action(run, action_def, tag, app, step_label):
         return _wait_for_build_completion(build_num)
 
     elif action_type == 'health_check':
-        from config.settings import AVAILABLE_CHECKS
+        from app.routes import all_check_keys
         options = {
             'task_type': 'health_check',
             'rca_level': 'none',
             'run_name': f"{tag['label']} {step_label} Health Check",
             '_upgrade_context': tag,
         }
-        checks = list(AVAILABLE_CHECKS.keys())
+        checks = all_check_keys()
         build_num = start_build(checks, options, user_id=user_id)
         run.test_build_number = build_num
         run.append_log(f"{step_label} Started health check build #{build_num}")
@@ -2,6 +2,7 @@
 import logging
 import os
 import smtplib
+from collections import Counter
 from datetime import datetime
 from email import encoders
 from email.mime.base import MIMEBase
@@ -153,10 +154,13 @@ def _build_html(run, pipeline_name, steps, total_duration, success):
     rd = run.report_data or {}
     upgrade_html = _upgrade_cards(rd)
 
-    n_upgrade = sum(1 for s in steps if s.get('type', '').startswith('upgrade'))
-    n_test = sum(1 for s in steps if s.get('type') in ('test_suite', 'template', 'health_check'))
-    n_pass = sum(1 for s in steps if s.get('status') == 'success')
-    n_fail = sum(1 for s in steps if s.get('status') in ('failed', 'error'))
+    # One pass over the steps for all four summary counts
+    types = Counter(s.get('type') or '' for s in steps)
+    statuses = Counter(s.get('status') for s in steps)
+    n_upgrade = sum(n for t, n in types.items() if t.startswith('upgrade'))
+    n_test = types['test_suite'] + types['template'] + types['health_check']
+    n_pass = statuses['success']
+    n_fail = statuses['failed'] + statuses['error']
 
     log_html = (run.log or '').replace('<', '&lt;').replace('>', '&gt;')
 
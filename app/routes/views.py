@@ -1,4 +1,5 @@
 """Page-rendering routes."""
+from collections import Counter
 from urllib.parse import urlparse
 
 from flask import render_template, request, send_from_directory, redirect, url_for
@@ -24,16 +25,18 @@ from app.routes import (
     dashboard_bp,
     _DEFAULT_CNV_SETTINGS,
     AVAILABLE_AGENTS,
+    all_check_keys,
+    check_categories,
     DEFAULT_SETTINGS,
     DEFAULT_THRESHOLDS,
+    enriched_schedules,
+    find_build,
+    find_running_job,
     load_builds,
-    load_schedules,
     load_settings,
-    get_cron_display,
-    get_next_run_time,
+    get_output,
     queued_jobs,
     running_jobs,
-    schedules,
     _jobs_lock,
     get_hosts_for_user,
 )
@@ -42,7 +45,7 @@ from app.routes import (
 @login_required
 def help_page():
     """Help and documentation page"""
-    categories = sorted(set(c['category'] for c in AVAILABLE_CHECKS.values()))
+    categories = check_categories()
     return render_template('help.html',
                            active_page='help',
                            checks=AVAILABLE_CHECKS,
@@ -66,13 +69,14 @@ def dashboard():
     if view == 'mine' and current_user.is_authenticated:
         display_builds = [b for b in all_builds if b.get('triggered_by') == current_user.username]
 
-    # Calculate stats
+    # Calculate stats (one pass over the loaded history)
+    status_counts = Counter(b.get('status') for b in all_builds)
     stats = {
         'total': len(all_builds) + len(running_list),
         'running': len(running_list),
-        'success': sum(1 for b in all_builds if b.get('status') == 'success'),
-        'unstable': sum(1 for b in all_builds if b.get('status') == 'unstable'),
-        'failed': sum(1 for b in all_builds if b.get('status') == 'failed')
+        'success': status_counts['success'],
+        'unstable': status_counts['unstable'],
+        'failed': status_counts['failed']
     }
 
     # Load user templates for sidebar
@@ -110,7 +114,7 @@ def dashboard():
 @operator_required
 def configure():
     """Build configuration page"""
-    categories = sorted(set(c['category'] for c in AVAILABLE_CHECKS.values()))
+    categories = check_categories()
     preset = request.args.get('preset', '')
     settings = load_settings()
     thresholds = settings.get('thresholds', DEFAULT_THRESHOLDS)
@@ -165,15 +169,12 @@ def configure():
 @login_required
 def history():
     """Build history page"""
-    all_builds = load_builds()
     status_filter = request.args.get('status')
     view = request.args.get('view', 'all')
 
-    filtered_builds = all_builds
-    if view == 'mine' and current_user.is_authenticated:
-        filtered_builds = [b for b in filtered_builds if b.get('triggered_by') == current_user.username]
-    if status_filter:
-        filtered_builds = [b for b in filtered_builds if b.get('status') == status_filter]
+    # Both filters run in SQL rather than over the loaded history.
+    mine = view == 'mine' and current_user.is_authenticated
+    filtered_builds = load_builds(user_id=current_user.id if mine else None, status=status_filter)
 
     return render_template('history.html',
                            builds=filtered_builds,
@@ -185,21 +186,18 @@ def history():
 @login_required
 def schedules_page():
     """Scheduled tasks page"""
-    load_schedules()
     status_filter = request.args.get('status')
-
-    for schedule in schedules:
-        schedule['next_run'] = get_next_run_time(schedule)
-        schedule['cron_display'] = get_cron_display(schedule)
+    schedules = enriched_schedules()
 
     filtered_schedules = schedules
     if status_filter:
         filtered_schedules = [s for s in schedules if s.get('status') == status_filter]
 
+    active = [s for s in schedules if s.get('status') == 'active']
     scheduler_status = {
-        'active_schedules': sum(1 for s in schedules if s.get('status') == 'active'),
+        'active_schedules': len(active),
         'runs_today': 0,
-        'next_run': min((s.get('next_run') for s in schedules if s.get('status') == 'active' and s.get('next_run')), default=None)
+        'next_run': min((s['next_run'] for s in active if s.get('next_run')), default=None)
     }
 
     return render_template('schedules.html',
@@ -212,15 +210,10 @@ def schedules_page():
 @login_required
 def build_detail(build_num):
     """Build detail page"""
-    all_builds = load_builds()
-    build = next((b for b in all_builds if b.get('number') == build_num), None)
+    build = find_build(build_num)
 
     if not build:
-        with _jobs_lock:
-            for job_id, job in running_jobs.items():
-                if job.get('number') == build_num:
-                    build = job
-                    break
+        build = find_running_job(build_num)
 
     if not build:
         return "Build not found", 404
@@ -258,15 +251,12 @@ def build_detail(build_num):
 @login_required
 def console_output(build_num):
     """Console output page"""
-    all_builds = load_builds()
-    build = next((b for b in all_builds if b.get('number') == build_num), None)
+    build = find_build(build_num)
 
     if not build:
-        with _jobs_lock:
-            for job_id, job in running_jobs.items():
-                if job.get('number') == build_num:
-                    build = job
-                    break
+        job = find_running_job(build_num)
+        if job is not None:
+            build = {**job, 'output': get_output(job)}
 
     if not build:
         return "Build not found", 404
@@ -280,11 +270,12 @@ def rebuild(build_num):
     """Rebuild with same parameters"""
     from app.routes.build_executor import start_build
 
-    all_builds = load_builds()
-    build = next((b for b in all_builds if b.get('number') == build_num), None)
+    build = find_build(build_num)
 
     if build:
-        checks = build.get('checks', list(AVAILABLE_CHECKS.keys()))
+        checks = build.get('checks')
+        if checks is None:
+            checks = all_check_keys()
         options = build.get('options', {'rca_level': 'none', 'jira': False, 'email': False})
         user_id = current_user.id if current_user.is_authenticated else None
         new_build_num = start_build(checks, options, user_id=user_id)
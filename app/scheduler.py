@@ -25,10 +25,11 @@ check_interval = 60  # Check every minute
 
 def load_schedules():
     """Load schedules from file"""
+    from app.routes import _json_loads
     if os.path.exists(SCHEDULES_FILE):
         try:
-            with open(SCHEDULES_FILE, 'r') as f:
-                return json.load(f)
+            with open(SCHEDULES_FILE, 'rb') as f:
+                return _json_loads(f.read())
         except (json.JSONDecodeError, OSError, ValueError):
             return []
     return []
@@ -36,8 +37,8 @@ def load_schedules():
 
 def save_schedules(schedules):
     """Save schedules to file"""
-    with open(SCHEDULES_FILE, 'w') as f:
-        json.dump(schedules, f, indent=2)
+    from app.routes import _write_json_file
+    _write_json_file(SCHEDULES_FILE, schedules)
 
 
 def should_run_now(schedule):
@@ -83,12 +84,13 @@ def should_run_now(schedule):
 
 def run_schedule(schedule, app):
     """Execute a scheduled task"""
-    from app.routes import start_build
-    from config.settings import AVAILABLE_CHECKS
+    from app.routes import all_check_keys, start_build
 
     print(f"[Scheduler] Running schedule: {schedule.get('name', 'Unnamed')}")
 
-    checks = schedule.get('checks', list(AVAILABLE_CHECKS.keys()))
+    checks = schedule.get('checks')
+    if checks is None:
+        checks = all_check_keys()
     options = schedule.get('options', {'rca_level': 'none'})
 
     # Mark as scheduled build
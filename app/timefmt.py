@@ -0,0 +1,33 @@
+"""Per-second cached HH:MM:SS stamps for console and run-log lines."""
+import time
+
+# utc flag -> (epoch second, formatted stamp); each tuple is swapped in whole.
+_hhmmss_cache = {False: (None, ''), True: (None, '')}
+
+
+def hhmmss(utc=False):
+    """Current time as HH:MM:SS (local, or UTC with ``utc=True``); formatted at most once per second."""
+    now = int(time.time())
+    cached = _hhmmss_cache[utc]
+    if cached[0] != now:
+        cached = (now, time.strftime('%H:%M:%S', time.gmtime(now) if utc else time.localtime(now)))
+        _hhmmss_cache[utc] = cached
+    return cached[1]
+
+
+_RUN_LOG_MARKS = {
+    'phase': '▶ ',
+    'ok': '✅ ',
+    'fail': '❌ ',
+    'warn': '⚠️  ',
+    'wait': '⏳ ',
+    'skip': '⏭️  ',
+}
+
+
+def run_log_prefix(level):
+    """``[HH:MM:SS] <mark>`` prefix (UTC) for one upgrade run-log line at ``level``."""
+    ts = hhmmss(utc=True)
+    if level == 'divider':
+        return f'[{ts}] {"─" * 50}\n[{ts}] '
+    return f'[{ts}] {_RUN_LOG_MARKS.get(level, "")}'
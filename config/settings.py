@@ -77,9 +77,14 @@ class Config:
     FLASK_PORT = int(os.getenv("FLASK_PORT", "5000"))
     DASHBOARD_BASE_URL = os.getenv("DASHBOARD_BASE_URL", "http://10.46.254.144:5000")
     FLASK_DEBUG = False
+    # Request body cap (bytes); uploads are custom-check scripts and JSON exports
+    MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', str(16 * 1024 * 1024)))
     
     # Build Configuration
     MAX_BUILDS_HISTORY = 100
+    # Live console tail kept in memory per running build (chunks written to the
+    # log, roughly lines); the full log is spooled to disk regardless.
+    MAX_OUTPUT_LINES = int(os.getenv('MAX_OUTPUT_LINES', '4000'))
     
     # Health Check Thresholds
     CPU_WARNING_THRESHOLD = 85
@@ -38,6 +38,7 @@ def _get_scenario_meta():
 # ── Output parser ─────────────────────────────────────────────────────────────
 
 _ANSI_RE = re.compile(r'\x1b\[[0-9;]*m')
+_CNV_SUMMARY_RE = re.compile(r'PASSED:\s*(\d+)\s*\|\s*FAILED:\s*(\d+)\s*\|\s*TOTAL:\s*(\d+)')
 
 
 def strip_ansi(s):
@@ -61,13 +62,19 @@ def parse_cnv_results(raw_output):
             "passed": int,
             "failed": int,
             "total": int,
+            "summary": {"passed": int, "failed": int, "total": int} or None,
         }
+
+    ``summary`` holds the counts from the last PASSED/FAILED/TOTAL line, or
+    None when the run never printed one (the top-level counts may then be
+    derived from the tests list).
     """
     lines = raw_output.split('\n')
     tests = []
     passed = 0
     failed = 0
     total = 0
+    summary = None
 
     # Regex to strip the [HH:MM:SS] timestamp prefix that cnv_scenarios.py adds
     _TS_RE = re.compile(r'^\[?\d{2}:\d{2}:\d{2}\]?\s*')
@@ -129,11 +136,12 @@ def parse_cnv_results(raw_output):
     # Pattern 2: "PASSED: X | FAILED: Y | TOTAL: Z"
     for line in lines:
         clean = strip_ansi(line)
-        match = re.search(r'PASSED:\s*(\d+)\s*\|\s*FAILED:\s*(\d+)\s*\|\s*TOTAL:\s*(\d+)', clean)
+        match = _CNV_SUMMARY_RE.search(clean)
         if match:
             passed = int(match.group(1))
             failed = int(match.group(2))
             total = int(match.group(3))
+            summary = {"passed": passed, "failed": failed, "total": total}
 
     # If we didn't find the summary table, try to extract individual PASS/FAIL lines
     if not tests:
@@ -187,6 +195,7 @@ def parse_cnv_results(raw_output):
         "passed": passed,
         "failed": failed,
         "total": total,
+        "summary": summary,
         "iteration_data": iteration_data,
     }
 
@@ -9,12 +9,14 @@ Or use the scripts/start_dashboard.sh script which also opens the browser.
 """
 
 import os
+import signal
 import sys
 
 # Ensure the app directory is in the path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from app import create_app
+from app.decorators import stop_audit_writer
 from config.settings import Config
 
 
@@ -27,10 +29,19 @@ def ensure_dirs():
         os.makedirs(os.path.join(data_dir, "logs"), exist_ok=True)
 
 
+def _handle_sigterm(signum, frame):
+    """Stop cleanly on SIGTERM: flush the audit writer (including the batch it
+    holds), then exit normally so the remaining atexit hooks run too."""
+    stop_audit_writer()
+    sys.exit(0)
+
+
 def main():
     """Main entry point for CNV HealthCrew AI."""
     ensure_dirs()
     app = create_app()
+
+    signal.signal(signal.SIGTERM, _handle_sigterm)
     
     print(f"""
 ╔════════════════════════════════════════════════════════════╗
@@ -0,0 +1,38 @@
+"""Shared pytest fixtures: the Flask app bound to a throwaway SQLite database."""
+import os
+import sys
+import tempfile
+
+import pytest
+
+# Must be set before config.settings is imported, so nothing touches the real database.
+_DB_DIR = tempfile.mkdtemp(prefix='healthcrew-tests-')
+os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(_DB_DIR, 'healthcrew.db')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture(scope='session')
+def app():
+    from app import create_app
+    app = create_app()
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def admin_client(app):
+    """Test client logged in as an admin user."""
+    from app.models import User, db
+    with app.app_context():
+        user = User.query.filter_by(username='test-admin').first()
+        if user is None:
+            user = User(username='test-admin', email='test-admin@example.com', role='admin')
+            user.set_password('test-admin-password')
+            db.session.add(user)
+            db.session.commit()
+        user_id = user.id
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(user_id)
+        session['_fresh'] = True
+    return client
@@ -0,0 +1,44 @@
+"""Audit queue: batched writes must not lose entries."""
+import time
+
+import pytest
+
+import run
+from app import decorators
+from app.models import AuditLog
+
+
+def _audit_rows(app, marker):
+    with app.app_context():
+        return [(a.action, a.details) for a in AuditLog.query.filter_by(target=marker).order_by(AuditLog.id)]
+
+
+def _row(action, marker, details):
+    return {'user_id': None, 'username': 'system', 'action': action,
+            'target': marker, 'details': details, 'ip_address': None}
+
+
+def test_failed_batch_only_drops_the_bad_row(app):
+    marker = 'test-audit-bad-row'
+    if decorators._audit_app is None:
+        decorators._audit_app = app
+    decorators._write_audit_rows([
+        _row('first', marker, 'a'),
+        _row(None, marker, 'violates NOT NULL'),
+        _row('second', marker, 'b'),
+    ])
+    assert _audit_rows(app, marker) == [('first', 'a'), ('second', 'b')]
+
+
+def test_sigterm_path_flushes_the_batch_held_by_the_writer(app):
+    marker = 'test-audit-shutdown'
+    with app.test_request_context():
+        decorators.log_audit('shutdown_test', target=marker, details='queued')
+    # Let the writer take the entry off the queue; it then holds it for up
+    # to _AUDIT_FLUSH_INTERVAL waiting for more, so nothing is written yet.
+    time.sleep(0.1)
+    assert decorators._audit_thread is not None
+    with pytest.raises(SystemExit):
+        run._handle_sigterm(15, None)
+    assert decorators._audit_thread is None
+    assert _audit_rows(app, marker) == [('shutdown_test', 'queued')]
@@ -0,0 +1,61 @@
+"""Build output helpers: results must match the straightforward implementations they replace."""
+import io
+import random
+
+import pytest
+
+from app.routes import build_stream
+
+KEYWORDS = ('Running', 'Run', 'unning test', 'PASS', 'PASSED', 'Cleanup', 'clean', 'Error', 'err', 'ror:')
+_WORDS = KEYWORDS + ('foo', 'bar', 'Ru', 'nning', 'ERR', 'test', ':', '[12:00:00]', 'Clean', 'PAS')
+
+
+def _reference_rank(keywords, line):
+    return next((rank for rank, keyword in enumerate(keywords) if keyword in line), None)
+
+
+def _random_line(rng):
+    return rng.choice(('', ' ')).join(rng.choice(_WORDS) for _ in range(rng.randint(0, 12)))
+
+
+@pytest.fixture(params=['automaton', 'regex'])
+def keyword_matcher(request, monkeypatch):
+    """_keyword_matcher on each backend: the pyahocorasick automaton and the regex fallback."""
+    if request.param == 'automaton' and build_stream.ahocorasick is None:
+        pytest.skip('pyahocorasick not installed')
+    if request.param == 'regex':
+        monkeypatch.setattr(build_stream, 'ahocorasick', None)
+    build_stream._keyword_matcher.cache_clear()
+    yield build_stream._keyword_matcher
+    build_stream._keyword_matcher.cache_clear()
+
+
+@pytest.mark.parametrize('keywords', [KEYWORDS, KEYWORDS[::-1], KEYWORDS[:1], ()])
+def test_keyword_matcher_matches_unbounded_scan(keyword_matcher, keywords):
+    match = keyword_matcher(keywords)
+    rng = random.Random(6009)
+    for _ in range(20000):
+        line = _random_line(rng)
+        assert match(line) == _reference_rank(keywords, line), line
+
+
+def _reference_split(data):
+    return io.TextIOWrapper(io.BytesIO(data), encoding='utf-8', errors='replace').readlines()
+
+
+@pytest.mark.parametrize('data', [
+    b'',
+    b'one\ntwo\n',
+    b'one\ntwo',
+    b'crlf\r\nline\r\n',
+    b'old mac\rline\r',
+    b'mixed\r\n\r\rend',
+    b'\n\n\n',
+    'unicode ✓ ❌\n'.encode('utf-8'),
+    b'bad \xff\xfe bytes\n',
+    b'progress 10%\rprogress 20%\rdone\n',
+])
+def test_split_output_matches_text_mode_reads(data):
+    text, lines = build_stream._split_output(data)
+    assert lines == _reference_split(data)
+    assert text == ''.join(lines)
@@ -0,0 +1,37 @@
+"""parse_cnv_results: the ``summary`` key reflects only an explicit PASSED/FAILED/TOTAL line."""
+from healthchecks.cnv_report import parse_cnv_results
+
+TABLE = '\n'.join([
+    '[14:30:00] Results Summary',
+    '[14:30:00] Test             Status   Validation   Duration',
+    '[14:30:00] ---------------------------------------------',
+    '[14:30:00] cpu-limits       PASS     OK           2m 30s',
+    '[14:30:00] memory-limits    FAIL     FAILED       1m 5s',
+    '[14:30:00] =============================================',
+])
+
+
+def test_summary_is_none_without_summary_line():
+    result = parse_cnv_results(TABLE)
+    assert result['summary'] is None
+    # Counts still fall back to the parsed table.
+    assert (result['passed'], result['failed'], result['total']) == (1, 1, 2)
+    assert [(t['name'], t['status'], t['duration_secs']) for t in result['tests']] == [
+        ('cpu-limits', 'PASS', 150), ('memory-limits', 'FAIL', 65)]
+
+
+def test_summary_uses_last_summary_line():
+    output = '\n'.join([
+        TABLE,
+        '[14:31:00] PASSED: 0 | FAILED: 0 | TOTAL: 0',
+        '[14:32:00] \x1b[32mPASSED: 3 | FAILED: 1 | TOTAL: 4\x1b[0m',
+    ])
+    result = parse_cnv_results(output)
+    assert result['summary'] == {'passed': 3, 'failed': 1, 'total': 4}
+    assert (result['passed'], result['failed'], result['total']) == (3, 1, 4)
+
+
+def test_zero_total_summary_is_still_reported():
+    result = parse_cnv_results('PASSED: 0 | FAILED: 0 | TOTAL: 0\n')
+    assert result['summary'] == {'passed': 0, 'failed': 0, 'total': 0}
+    assert result['tests'] == []
@@ -0,0 +1,16 @@
+"""Custom check uploads store the script text exactly as uploaded."""
+import io
+
+from app.models import CustomCheck
+
+
+def test_uploaded_crlf_script_is_stored_unchanged(app, admin_client):
+    body = b'#!/bin/bash\r\necho "ok \xe2\x9c\x93"\r\nprintf "a\\rb"\rexit 0\r\n'
+    response = admin_client.post('/api/custom-checks', data={
+        'name': 'test-crlf-upload',
+        'script_file': (io.BytesIO(body), 'check.sh'),
+    }, content_type='multipart/form-data')
+    assert response.get_json()['success']
+    with app.app_context():
+        check = CustomCheck.query.filter_by(name='test-crlf-upload').one()
+        assert check.script_content.encode('utf-8') == body
@@ -0,0 +1,82 @@
+"""Issue extraction must keep returning what the original list-then-dedupe version did."""
+import re
+
+from app.routes.issues import extract_issues_from_output, has_issue_candidates
+
+SAMPLE = '\n'.join([
+    '[10:00:00] ❌ openshift-cnv/virt-handler-abc12 CrashLoopBackOff (restarts: 7)',
+    '[10:00:01] ⚠️ openshift-storage/rook-ceph-osd-0 Pending',
+    '[10:00:02] ❌ openshift-cnv/virt-handler-abc12 Error',
+    '[10:00:03] ❌ kubevirt-hyperconverged Degraded',
+    '[10:00:04] ⚠️ machine-config Not Available',
+    '[10:00:05] ❌ kubevirt-hyperconverged degraded',
+    '[10:00:06] VM live migration of rhel9-vm failed after 3 attempts',
+    '[10:00:07] migration stuck in Scheduling',
+    '[10:00:08] PVC data-vm-1 Pending; volume attach error on worker-2',
+    '[10:00:09] ODF cluster not ready',
+    '[10:00:10] node worker-3 NotReady',
+    '[10:00:11] Nodes worker-4 SchedulingDisabled',
+    '[10:00:12] container killed: OOMKilled',
+])
+
+
+def _reference_extract(output):
+    issues = []
+    for m in re.finditer(r'[❌⚠️]\s*(\S+)/(\S+)\s+(\S+.*?)(?:\n|$)', output):
+        issues.append({'type': 'pod', 'namespace': m.group(1), 'name': m.group(2), 'status': m.group(3).strip()})
+    for m in re.finditer(r'[❌⚠️]\s*([\w-]+)\s+(Degraded|Unavailable|Not Available)', output, re.IGNORECASE):
+        issues.append({'type': 'operator', 'name': m.group(1), 'status': m.group(2)})
+    for m in re.finditer(r'migration.*?(failed|stuck|error)', output, re.IGNORECASE):
+        issues.append({'type': 'migration', 'name': 'vm-migration', 'status': m.group(1)})
+    for m in re.finditer(r'(pvc|volume|storage|odf).*?(pending|failed|error|not ready)', output, re.IGNORECASE):
+        issues.append({'type': 'storage', 'name': m.group(1), 'status': m.group(2)})
+    for m in re.finditer(r'node[s]?\s+(\S+)\s+(NotReady|SchedulingDisabled)', output, re.IGNORECASE):
+        issues.append({'type': 'node', 'name': m.group(1), 'status': m.group(2)})
+    if 'OOMKilled' in output or 'oom' in output.lower():
+        issues.append({'type': 'resource', 'name': 'oom-event', 'status': 'OOMKilled'})
+    seen, unique = set(), []
+    for issue in issues:
+        key = (issue['type'], issue.get('name', ''), issue.get('namespace', ''))
+        if key not in seen:
+            seen.add(key)
+            unique.append(issue)
+    return unique
+
+
+def test_matches_reference_implementation():
+    lines = SAMPLE.split('\n')
+    for output in (SAMPLE, SAMPLE + '\n', '\n'.join(reversed(lines)), '', 'all checks passed\n'):
+        assert extract_issues_from_output(output) == _reference_extract(output)
+
+
+def test_golden_issues():
+    issues = extract_issues_from_output(SAMPLE)
+    assert [(i['type'], i['name'], i.get('namespace', ''), i['status']) for i in issues] == [
+        ('pod', 'virt-handler-abc12', 'openshift-cnv', 'CrashLoopBackOff (restarts: 7)'),
+        ('pod', 'rook-ceph-osd-0', 'openshift-storage', 'Pending'),
+        ('operator', 'kubevirt-hyperconverged', '', 'Degraded'),
+        ('operator', 'machine-config', '', 'Not Available'),
+        ('migration', 'vm-migration', '', 'failed'),
+        ('storage', 'storage', '', 'Pending'),
+        ('storage', 'PVC', '', 'Pending'),
+        ('storage', 'volume', '', 'error'),
+        ('storage', 'ODF', '', 'not ready'),
+        ('node', 'worker-3', '', 'NotReady'),
+        ('node', 'worker-4', '', 'SchedulingDisabled'),
+        ('resource', 'oom-event', '', 'OOMKilled'),
+    ]
+
+
+def test_prefilter_admits_issue_lines_without_warning_or_error_markers():
+    for line in ('node worker-3 NotReady', 'container killed: OOMKilled', 'PVC data-vm-1 Pending'):
+        assert not any(m in line for m in ('WARNING', 'Issues:', 'ISSUES', 'ERROR', 'CRITICAL', '⚠️', '❌'))
+        assert has_issue_candidates(line)
+        assert extract_issues_from_output(line)
+
+
+def test_prefilter_only_rejects_output_with_no_issues():
+    assert not has_issue_candidates('All 42 checks passed\nCluster healthy\n')
+    for line in SAMPLE.split('\n'):
+        if not has_issue_candidates(line):
+            assert extract_issues_from_output(line) == []
+    assert has_issue_candidates(SAMPLE)
@@ -0,0 +1,69 @@
+"""Running-job console output: bounded live tail, complete spooled log."""
+import threading
+import time
+
+from app.routes import output
+
+
+def _job():
+    return {'output': output.new_output(), 'output_log': output.new_output_log(),
+            'output_lock': threading.Lock()}
+
+
+def test_full_output_survives_tail_rollover():
+    job = _job()
+    chunks = [f'line {i} ✓\n' for i in range(output._OUTPUT_TAIL_CHUNKS * 3)]
+    for chunk in chunks:
+        output._log(job, chunk)
+    assert len(job['output']) == output._OUTPUT_TAIL_CHUNKS
+    assert output.get_output(job) == ''.join(chunks[-output._OUTPUT_TAIL_CHUNKS:])
+    assert output.get_full_output(job) == ''.join(chunks)
+    output.close_output_log(job)
+
+
+def test_close_output_log_releases_the_spool_file():
+    job = _job()
+    log = job['output_log']
+    output._log(job, 'saved\n')
+    output.close_output_log(job)
+    output.close_output_log(job)
+    assert log.closed and 'output_log' not in job
+    # Late writers (e.g. a build thread racing api_stop) still reach the tail.
+    output._log(job, 'after close\n')
+    assert output.get_full_output(job) == 'saved\nafter close\n'
+
+
+class _SlowSpool:
+    """Spool file whose writes pause midway, so a concurrent close lands inside one."""
+
+    def __init__(self):
+        self._file = output.new_output_log()
+        self.writing = threading.Event()
+
+    def write(self, data):
+        self.writing.set()
+        time.sleep(0.05)
+        return self._file.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def test_close_waits_for_an_in_flight_write():
+    job = _job()
+    job['output_log'] = spool = _SlowSpool()
+    errors = []
+
+    def build_thread():
+        try:
+            output._log(job, 'last line\n')
+        except Exception as exc:  # ValueError: write to closed file
+            errors.append(exc)
+
+    writer = threading.Thread(target=build_thread)
+    writer.start()
+    spool.writing.wait(1)
+    assert output.get_full_output(job) == 'last line\n'  # what api_stop saves
+    output.close_output_log(job)
+    writer.join()
+    assert errors == []
@@ -0,0 +1,89 @@
+"""api_stop's exit wait must work for any descriptor number and honour its timeout."""
+import os
+import resource
+import signal
+import subprocess
+import sys
+import time
+
+import pytest
+
+from app.routes.api import _wait_for_exit
+
+
+def _spawn(*cmd):
+    return subprocess.Popen(list(cmd), start_new_session=True)
+
+
+def test_wait_returns_once_the_process_exits():
+    proc = _spawn('sleep', '30')
+    os.killpg(proc.pid, signal.SIGTERM)
+    assert _wait_for_exit(proc, 5)
+    assert proc.returncode == -signal.SIGTERM
+
+
+def test_wait_times_out_for_a_process_ignoring_sigterm():
+    ignore_term = 'import signal, time; signal.signal(signal.SIGTERM, signal.SIG_IGN); time.sleep(30)'
+    proc = _spawn(sys.executable, '-c', ignore_term)
+    try:
+        time.sleep(0.5)  # let the child install its handler
+        os.killpg(proc.pid, signal.SIGTERM)
+        started = time.monotonic()
+        assert not _wait_for_exit(proc, 0.5)
+        assert time.monotonic() - started < 3
+    finally:
+        os.killpg(proc.pid, signal.SIGKILL)
+        assert _wait_for_exit(proc, 5)
+
+
+def test_wait_handles_descriptors_above_fd_setsize():
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if hard != resource.RLIM_INFINITY and hard < 1100:
+        pytest.skip('descriptor limit too low to reach FD_SETSIZE')
+    resource.setrlimit(resource.RLIMIT_NOFILE, (max(soft, 1100), hard))
+    fillers = []
+    try:
+        while True:
+            fd = os.open(os.devnull, os.O_RDONLY)
+            fillers.append(fd)
+            if fd >= 1024:
+                break
+        proc = _spawn('sleep', '30')
+        os.killpg(proc.pid, signal.SIGTERM)
+        assert _wait_for_exit(proc, 5)
+    finally:
+        for fd in fillers:
+            os.close(fd)
+        resource.setrlimit(resource.RLIMIT_NOFILE, (soft, hard))
+
+
+def test_already_reaped_child_does_not_open_a_pidfd(monkeypatch):
+    proc = _spawn('true')
+    proc.wait()  # the build thread's stream_subprocess got there first
+
+    def no_pidfd(pid):
+        raise AssertionError('pidfd_open on a reaped (possibly recycled) pid')
+
+    monkeypatch.setattr(os, 'pidfd_open', no_pidfd, raising=False)
+    assert _wait_for_exit(proc, 5)
+
+
+@pytest.mark.skipif(not hasattr(os, 'pidfd_open'), reason='needs pidfd_open')
+def test_child_reaped_while_opening_the_pidfd_is_not_waited_on(monkeypatch):
+    proc = _spawn('sleep', '0.3')  # still running at the first poll()
+    unrelated = _spawn('sleep', '30')
+    real_pidfd_open = os.pidfd_open
+
+    def reaped_then_recycled(pid):
+        # Simulate the race: the child is reaped and its pid now names another process.
+        proc.wait()
+        return real_pidfd_open(unrelated.pid)
+
+    monkeypatch.setattr(os, 'pidfd_open', reaped_then_recycled)
+    try:
+        started = time.monotonic()
+        assert _wait_for_exit(proc, 5)
+        assert time.monotonic() - started < 1
+    finally:
+        unrelated.kill()
+        unrelated.wait()
@@ -0,0 +1,42 @@
+"""Settings GETs: ETag tracks the settings content and a matching If-None-Match gets a 304."""
+import pytest
+
+from app.routes import store
+
+
+@pytest.fixture
+def settings_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, 'SETTINGS_FILE', str(tmp_path / 'settings.json'))
+    monkeypatch.setattr(store, '_settings_cache', (None, None, None))
+
+
+def test_settings_etag_and_not_modified(admin_client, settings_file):
+    first = admin_client.get('/api/settings')
+    assert first.status_code == 200
+    assert first.get_json() == store.DEFAULT_SETTINGS
+    etag = first.headers['ETag']
+
+    again = admin_client.get('/api/settings', headers={'If-None-Match': etag})
+    assert again.status_code == 304
+    assert again.data == b''
+    assert again.headers['ETag'] == etag
+
+    store.save_settings({'ssh': {'host': 'bastion.example.com'}})
+    changed = admin_client.get('/api/settings', headers={'If-None-Match': etag})
+    assert changed.status_code == 200
+    assert changed.headers['ETag'] != etag
+    assert changed.get_json()['ssh'] == {'host': 'bastion.example.com', 'user': 'root'}
+    assert changed.get_json()['thresholds'] == store.DEFAULT_THRESHOLDS
+
+
+def test_thresholds_share_the_settings_etag(admin_client, settings_file):
+    store.save_settings({'thresholds': {'cpu_warning': 90}})
+    settings_etag = admin_client.get('/api/settings').headers['ETag']
+
+    response = admin_client.get('/api/settings/thresholds')
+    assert response.status_code == 200
+    assert response.headers['ETag'] == settings_etag
+    assert response.get_json() == {**store.DEFAULT_THRESHOLDS, 'cpu_warning': 90}
+
+    cached = admin_client.get('/api/settings/thresholds', headers={'If-None-Match': settings_etag})
+    assert cached.status_code == 304
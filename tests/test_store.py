@@ -0,0 +1,100 @@
+"""JSON-file stores: indexes follow every list change; suggested-check saves are debounced."""
+import json
+import logging
+import time
+
+import pytest
+
+from app.routes import store
+
+
+@pytest.fixture
+def empty_schedules(app, monkeypatch):
+    saved = list(store.schedules)
+    store.schedules.clear()
+    monkeypatch.setattr(store, '_schedules_by_id', None)
+    yield store.schedules
+    store.schedules[:] = saved
+
+
+@pytest.fixture
+def empty_suggested(app, monkeypatch):
+    saved = list(store.suggested_checks)
+    store.suggested_checks.clear()
+    monkeypatch.setattr(store, '_suggested_by_name', None)
+    yield store.suggested_checks
+    store.suggested_checks[:] = saved
+
+
+def test_find_schedule_sees_added_and_removed_schedules(empty_schedules):
+    first = {'id': 'aaaa0001', 'name': 'first'}
+    assert store.find_schedule('aaaa0001') is None
+    store.add_schedule(first)
+    assert store.find_schedule('aaaa0001') is first
+    # Same length as before the swap: a length-keyed index would miss this.
+    store.remove_schedule(first)
+    second = {'id': 'aaaa0002', 'name': 'second'}
+    store.add_schedule(second)
+    assert store.find_schedule('aaaa0001') is None
+    assert store.find_schedule('aaaa0002') is second
+
+
+def test_record_suggested_check_merges_by_name(empty_suggested):
+    store.record_suggested_check({'name': 'etcd_defrag', 'status': 'accepted'})
+    store.record_suggested_check({'name': 'etcd_defrag', 'status': 'rejected', 'rejected_at': 'now'})
+    store.record_suggested_check({'name': 'odf_health', 'status': 'accepted'})
+    assert [(s['name'], s['status']) for s in empty_suggested] == [
+        ('etcd_defrag', 'rejected'), ('odf_health', 'accepted')]
+    assert store.find_suggested_check('odf_health') is empty_suggested[1]
+
+
+@pytest.fixture
+def suggested_file(empty_suggested, tmp_path, monkeypatch):
+    """Point the suggested-checks store at a temp file and count its writes."""
+    path = tmp_path / 'suggested.json'
+    writes = []
+    real_write = store._write_json_file
+
+    def counting_write(target, obj):
+        writes.append([dict(s) for s in obj])
+        real_write(target, obj)
+
+    monkeypatch.setattr(store, 'SUGGESTED_CHECKS_FILE', str(path))
+    monkeypatch.setattr(store, '_write_json_file', counting_write)
+    monkeypatch.setattr(store, '_suggested_mtime', store._suggested_mtime)
+    yield path, writes
+    store.flush_suggested_checks()
+
+
+def test_burst_of_saves_writes_once(suggested_file):
+    path, writes = suggested_file
+    for i in range(5):
+        store.record_suggested_check({'name': f'check_{i}', 'status': 'accepted'})
+        store.save_suggested_checks()
+    time.sleep(store._SUGGESTED_SAVE_DELAY * 3)
+    assert len(writes) == 1
+    assert [s['name'] for s in json.loads(path.read_text())] == [f'check_{i}' for i in range(5)]
+
+
+def test_flush_writes_pending_save_immediately(suggested_file):
+    path, writes = suggested_file
+    store.record_suggested_check({'name': 'pending', 'status': 'rejected'})
+    store.save_suggested_checks()
+    store.flush_suggested_checks()
+    assert writes == [[{'name': 'pending', 'status': 'rejected'}]]
+    assert json.loads(path.read_text()) == writes[0]
+    store.flush_suggested_checks()  # nothing pending: no second write
+    assert len(writes) == 1
+
+
+def test_failed_flush_is_logged(suggested_file, monkeypatch, caplog):
+    def failing_write(target, obj):
+        raise OSError('disk full')
+
+    monkeypatch.setattr(store, '_write_json_file', failing_write)
+    store.record_suggested_check({'name': 'lost', 'status': 'accepted'})
+    store.save_suggested_checks()
+    with caplog.at_level(logging.ERROR, logger=store.__name__):
+        store.flush_suggested_checks()
+    assert 'disk full' in caplog.text
+    assert store.find_suggested_check('lost') is not None